@@ -11,6 +11,32 @@ GOOGLE_MAPS_API_KEY: str = os.getenv("GOOGLE_MAPS_API_KEY", "")
 ACCEPTED_CITY: str = "高雄市"
 INPUT_DIR: str = os.path.join(PROJECT_ROOT, "data/original")
 PROCESSED_DIR: str = os.path.join(PROJECT_ROOT, "data/processed")
+PREPROCESS_WORKERS: int = int(os.getenv("PREPROCESS_WORKERS", str(os.cpu_count() or 1)))
+PREPROCESS_MEMORY_BUDGET: int = (
+    int(os.getenv("PREPROCESS_MEMORY_BUDGET_MB", "512")) << 20
+)
+METADATA_CACHE_FILE: str = os.path.join(PROJECT_ROOT, "data/cache/metadata.json")
+ARTIFACT_DIR: str = os.path.join(PROJECT_ROOT, "data/cache/artifacts")
+ARTIFACT_MAX_BYTES: int = int(os.getenv("ARTIFACT_MAX_BYTES", str(1 << 30)))
+ARTIFACT_MAX_AGE_DAYS: float = float(os.getenv("ARTIFACT_MAX_AGE_DAYS", "30"))
+INGEST_POLL_INTERVAL: float = float(os.getenv("INGEST_POLL_INTERVAL", "1"))
+INGEST_SETTLE_SECONDS: float = float(os.getenv("INGEST_SETTLE_SECONDS", "2"))
+INCIDENT_MAX_GAP_MINUTES: float = float(os.getenv("INCIDENT_MAX_GAP_MINUTES", "10"))
+INCIDENT_MAX_DISTANCE_M: float = float(os.getenv("INCIDENT_MAX_DISTANCE_M", "100"))
+DETECTION_MODEL_VARIANT: str = os.getenv("DETECTION_MODEL_VARIANT", "fp32")
+DETECTION_BATCH_SIZE: int = int(os.getenv("DETECTION_BATCH_SIZE", "1"))
+SAVE_DETECTION_CROPS: bool = os.getenv("SAVE_DETECTION_CROPS", "") == "1"
+BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_HEADLESS: bool = os.getenv("BROWSER_HEADLESS", "1") != "0"
+CAPTCHA_MIN_CONFIDENCE: float = float(os.getenv("CAPTCHA_MIN_CONFIDENCE", "0.9"))
+CAPTCHA_CORPUS_DIR: str = os.path.join(PROJECT_ROOT, "data/captcha_corpus")
+CAPTCHA_MAX_ATTEMPTS: int = int(os.getenv("CAPTCHA_MAX_ATTEMPTS", "3"))
+COLLECT_CAPTCHAS: bool = os.getenv("COLLECT_CAPTCHAS", "") == "1"
+REPORT_BACKEND: str = os.getenv("REPORT_BACKEND", "selenium")
+POLICE_MAILBOX_URL: str = os.getenv(
+    "POLICE_MAILBOX_URL", "https://policemail.kcg.gov.tw"
+)
+FONT_FILE: str = os.path.join(PROJECT_ROOT, "assets/fonts/NotoSans-Regular.ttf")
 
 
 POLICE_DICT: Dict[str, int] = {
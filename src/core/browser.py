@@ -0,0 +1,233 @@
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from src.config import BROWSER_HEADLESS, BROWSER_POOL_SIZE, POLICE_MAILBOX_URL
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+WINDOW_SIZE = "1280,1024"
+ACQUIRE_TIMEOUT = 60
+ACQUIRE_POLL = 5
+# Storage.clearDataForOrigin takes one exact origin, without wildcards
+MAILBOX_ORIGIN = urlsplit(POLICE_MAILBOX_URL)._replace(path="", query="").geturl()
+CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def create_driver(headless: bool = BROWSER_HEADLESS) -> webdriver.Chrome:
+    """
+    Launch a browser session for submitting reports.
+
+    Args:
+        headless (bool): Run without a visible window
+
+    Returns:
+        webdriver.Chrome: The Selenium WebDriver instance
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument(f"--window-size={WINDOW_SIZE}")
+    return webdriver.Chrome(options=chrome_options)
+
+
+def _is_healthy(driver: webdriver.Chrome) -> bool:
+    """Whether the session still answers commands."""
+    try:
+        return driver.execute_script("return 1") == 1
+    except Exception:
+        return False
+
+
+def _reset(driver: webdriver.Chrome) -> None:
+    """Returns a session to a blank state: one tab, no cookies, no web storage."""
+    for handle in driver.window_handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(driver.window_handles[0])
+
+    driver.execute_script(CLEAR_STORAGE_JS)
+    try:
+        # Every origin's cookies, not only the current page's
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except Exception:
+        driver.delete_all_cookies()
+    try:
+        # The site's storage, also when the session was left on another page
+        driver.execute_cdp_cmd(
+            "Storage.clearDataForOrigin",
+            {"origin": MAILBOX_ORIGIN, "storageTypes": "all"},
+        )
+    except Exception:
+        pass
+    driver.get("about:blank")
+
+
+def _quit(driver: webdriver.Chrome) -> None:
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class BrowserPool:
+    """Pre-launched browser sessions handed out one report at a time."""
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        factory: Callable[[], webdriver.Chrome] = create_driver,
+    ):
+        self.size = max(size, 1)
+        self.factory = factory
+        self.launches = 0
+        self.handouts = 0
+        self.replacements = 0
+        self.launch_times = []
+        self._idle: "queue.Queue[webdriver.Chrome]" = queue.Queue()
+        self._sessions = 0  # Launched or launching, idle or in use
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _launch(self) -> None:
+        """Launches one session into the idle queue."""
+        try:
+            started = time.perf_counter()
+            driver = self.factory()
+            with self._lock:
+                self.launches += 1
+                self.launch_times.append(time.perf_counter() - started)
+                if not self._closed:
+                    self._idle.put(driver)
+                    return
+                self._sessions -= 1
+            _quit(driver)
+        except Exception as e:
+            with self._lock:
+                self._sessions -= 1
+            status_print(f"Browser launch failed: {e}", StatusLevel.WARNING)
+
+    def _launch_in_background(self) -> None:
+        with self._lock:
+            if self._closed or self._sessions >= self.size:
+                return
+            self._sessions += 1
+        threading.Thread(target=self._launch, daemon=True).start()
+
+    def start(self) -> None:
+        """Launches the sessions in the background so they are warm when needed."""
+        for _ in range(self.size):
+            self._launch_in_background()
+
+    def acquire(self) -> webdriver.Chrome:
+        """
+        Take a clean, healthy session, launching or replacing one if needed.
+
+        Returns:
+            webdriver.Chrome: A session reserved for the caller until release()
+        """
+        deadline = time.monotonic() + ACQUIRE_TIMEOUT
+        while True:
+            self._launch_in_background()  # Only launches while below the pool size
+            try:
+                driver = self._idle.get(timeout=ACQUIRE_POLL)
+            except queue.Empty:
+                if time.monotonic() > deadline:
+                    raise TimeoutError("acquire(): No browser session became available")
+                continue
+            if _is_healthy(driver):
+                with self._lock:
+                    self.handouts += 1
+                return driver
+            self._discard(driver)
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        """Quits a broken session and launches its replacement."""
+        _quit(driver)
+        with self._lock:
+            self._sessions -= 1
+            self.replacements += 1
+        self._launch_in_background()
+
+    def release(self, driver: webdriver.Chrome) -> None:
+        """Resets a session and returns it to the pool, replacing it if it crashed."""
+        try:
+            _reset(driver)
+        except Exception:
+            self._discard(driver)
+            return
+
+        with self._lock:
+            if not self._closed:
+                self._idle.put(driver)
+                return
+            self._sessions -= 1
+        _quit(driver)
+
+    @contextmanager
+    def session(self) -> Iterator[webdriver.Chrome]:
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self) -> None:
+        """Quits every idle session; sessions in use are quit when released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            with self._lock:
+                self._sessions -= 1
+            _quit(driver)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            return {
+                "launches": self.launches,
+                "handouts": self.handouts,
+                "replacements": self.replacements,
+                "mean_launch_time": (
+                    sum(self.launch_times) / len(self.launch_times)
+                    if self.launch_times
+                    else None
+                ),
+            }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        if stats["mean_launch_time"] is None:
+            return "browser pool not started"
+        return (
+            f"browser pool: {stats['launches']} launch(es), "
+            f"mean {stats['mean_launch_time']:.1f}s, {stats['handouts']} session(s) "
+            f"handed out, {stats['replacements']} replaced"
+        )
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, closed when the process exits."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+            atexit.register(_pool.close)
+        return _pool
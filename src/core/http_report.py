@@ -0,0 +1,363 @@
+import mimetypes
+import os
+import re
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+from requests.adapters import HTTPAdapter
+
+from src.config import CAPTCHA_MAX_ATTEMPTS, COLLECT_CAPTCHAS, POLICE_MAILBOX_URL
+from src.data_handling.captcha import (
+    get_captcha_log,
+    save_captcha_sample,
+    save_unlabelled_captcha,
+)
+from src.data_handling.input import get_timestamped_jpeg_paths
+from src.data_handling.processing import load_rgb_array, solve_captcha
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+STATEMENT_URL = f"{POLICE_MAILBOX_URL}/Statement.aspx"
+REQUEST_TIMEOUT = 30
+CONNECTION_POOL_SIZE = 4
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36"
+)
+NON_VALUE_INPUTS = ("submit", "button", "image", "file", "reset")
+POSTBACK_TARGET = re.compile(r"__doPostBack\(\\?['\"]([^'\"\\]+)")
+
+
+class UnexpectedPageError(Exception):
+    """The site answered with a page the HTTP flow does not know how to drive."""
+
+
+def _form_fields(soup: BeautifulSoup) -> Dict[str, str]:
+    """
+    Collect the values a browser would post for the page's form.
+
+    Hidden ASP.NET state (__VIEWSTATE, __EVENTVALIDATION, ...) is carried along
+    with every other field, so each postback continues from the server's state.
+    """
+    fields = {}
+    form = soup.find("form")
+    if form is None:
+        return fields
+    for element in form.find_all(["input", "select", "textarea"]):
+        name = element.get("name")
+        if not name or element.has_attr("disabled"):
+            continue
+        if element.name == "select":
+            option = element.find("option", selected=True) or element.find("option")
+            if option is not None:
+                fields[name] = option.get("value", option.text)
+        elif element.name == "textarea":
+            fields[name] = element.text
+        else:
+            kind = element.get("type", "text").lower()
+            if kind in NON_VALUE_INPUTS:
+                continue
+            if kind in ("checkbox", "radio"):
+                if element.has_attr("checked"):
+                    fields[name] = element.get("value", "on")
+                continue
+            fields[name] = element.get("value", "")
+    return fields
+
+
+def _postback_target(element: Tag) -> Optional[str]:
+    """The __EVENTTARGET a control posts back with, or None if it does not."""
+    handler = " ".join(
+        element.get(attribute, "") for attribute in ("onchange", "onclick", "href")
+    )
+    match = POSTBACK_TARGET.search(handler)
+    return match.group(1) if match else None
+
+
+class _Page:
+    """A parsed form page and the values it would post as is."""
+
+    def __init__(self, response: requests.Response):
+        self.url = response.url
+        self.soup = BeautifulSoup(response.content, "html.parser")
+        self.fields = _form_fields(self.soup)
+
+    def has(self, element_id: str) -> bool:
+        return self.soup.find(id=element_id) is not None
+
+    def element(self, element_id: str) -> Tag:
+        element = self.soup.find(id=element_id)
+        if element is None:
+            raise UnexpectedPageError(f"URL={self.url}: {element_id} not found")
+        return element
+
+    def action(self) -> str:
+        form = self.soup.find("form")
+        return urljoin(self.url, form.get("action", "") if form else "")
+
+
+class FormSession:
+    """Drives ASP.NET WebForms pages over one HTTP session, as a browser would."""
+
+    def __init__(self, http: requests.Session):
+        self.http = http
+        self.requests = 0
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        response = self.http.request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+        self.requests += 1
+        if response.status_code != 200:
+            raise UnexpectedPageError(f"URL={url}: HTTP {response.status_code}")
+        return response
+
+    def get(self, url: str) -> _Page:
+        return _Page(self._send("GET", url))
+
+    def download(self, page: _Page, element_id: str) -> bytes:
+        """Fetch the resource an element points at (e.g. an image) in this session."""
+        return self._send(
+            "GET", urljoin(page.url, page.element(element_id)["src"])
+        ).content
+
+    def post(
+        self,
+        page: _Page,
+        fields: Dict[str, Optional[str]],
+        button: Optional[str] = None,
+        event_target: str = "",
+        files: Optional[List[str]] = None,
+    ) -> _Page:
+        """
+        Post the page's form back with some fields changed.
+
+        Args:
+            page (_Page): Page whose form is posted
+            fields (Dict[str, Optional[str]]): Field name to new value; None
+                leaves the field out, like an unchecked checkbox
+            button (Optional[str]): Id of the button or link clicked to post
+            event_target (str): Name of the control that started the postback
+            files (Optional[List[str]]): Paths to upload with the button's file input
+
+        Returns:
+            _Page: The page the server answered with
+        """
+        data = {**page.fields, **fields}
+        if button is not None:
+            element = page.element(button)
+            if element.name == "input":
+                data[element["name"]] = element.get("value", "")
+            else:  # A link button posts back through __doPostBack
+                event_target = _postback_target(element) or event_target
+        data["__EVENTTARGET"] = event_target
+        data["__EVENTARGUMENT"] = ""
+        data = {name: value for name, value in data.items() if value is not None}
+
+        with ExitStack() as stack:
+            uploads = None
+            if files:
+                upload_input = page.soup.find("input", type="file")
+                if upload_input is None:
+                    raise UnexpectedPageError(f"URL={page.url}: no file input")
+                uploads = [
+                    (
+                        upload_input["name"],
+                        (
+                            os.path.basename(path),
+                            stack.enter_context(open(path, "rb")),
+                            mimetypes.guess_type(path)[0] or "application/octet-stream",
+                        ),
+                    )
+                    for path in files
+                ]
+            return _Page(self._send("POST", page.action(), data=data, files=uploads))
+
+    def fill(
+        self, page: _Page, values: Dict[str, Union[str, bool]]
+    ) -> Tuple[_Page, Dict[str, Optional[str]]]:
+        """
+        Apply field values in order, posting back where a control would.
+
+        Mirrors fill_form(): a change to an AutoPostBack control (such as a
+        cascading dropdown) is posted back right away, and later fields are
+        looked up on the page that comes back.
+
+        Args:
+            page (_Page): Page holding the fields
+            values (Dict[str, Union[str, bool]]): Element id to text or option
+                value, or to the checked state of a radio button or checkbox
+
+        Returns:
+            Tuple[_Page, Dict[str, Optional[str]]]: The current page, and the
+            changes not posted yet, to be sent with the next postback
+        """
+        pending = {}
+        for element_id, value in values.items():
+            element = page.element(element_id)
+            name = element["name"]
+            if element.get("type") in ("checkbox", "radio"):
+                changed = element.has_attr("checked") != bool(value)
+                pending[name] = element.get("value", "on") if value else None
+            else:
+                if element.name == "select" and not any(
+                    option.get("value", option.text) == value
+                    for option in element.find_all("option")
+                ):
+                    raise ValueError(f"fill(): {element_id}: no option {value}")
+                changed = page.fields.get(name) != value
+                pending[name] = value
+
+            event_target = _postback_target(element)
+            if changed and event_target is not None:
+                page = self.post(page, pending, event_target=event_target)
+                pending = {}
+        return page, pending
+
+
+_http: Optional[requests.Session] = None
+_http_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide HTTP session, whose connections are kept alive."""
+    global _http
+    with _http_lock:
+        if _http is None:
+            _http = requests.Session()
+            _http.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(
+                pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE
+            )
+            _http.mount("https://", adapter)
+            _http.mount("http://", adapter)
+        return _http
+
+
+def _accept_terms(forms: FormSession) -> _Page:
+    page = forms.get(STATEMENT_URL)
+    page, pending = forms.fill(
+        page, {f"ContentPlaceHolder1_chk{i}": True for i in range(1, 5)}
+    )
+    page = forms.post(page, pending, button="ContentPlaceHolder1_IWantToReport")
+    page.element("ContentPlaceHolder1_Name")
+    return page
+
+
+def _upload_images(forms: FormSession, page: _Page, image_paths: List[str]) -> _Page:
+    page = forms.post(
+        page, {}, button="ContentPlaceHolder1_btnMailFile", files=image_paths
+    )
+    listed = page.soup.get_text()
+    missing = [p for p in image_paths if os.path.basename(p) not in listed]
+    if missing:
+        raise UnexpectedPageError(
+            f"URL={page.url}: uploads not listed: "
+            + ", ".join(os.path.basename(path) for path in missing)
+        )
+    return page
+
+
+def _submit(forms: FormSession, page: _Page, pending: Dict[str, Optional[str]]) -> None:
+    """
+    Solve the captcha and submit, solving a new one while it is rejected.
+
+    A rejected captcha comes back as the same form with its fields and uploads
+    kept, so only the captcha is fetched and solved again.
+    """
+    log = get_captcha_log()
+    for attempt in range(1, CAPTCHA_MAX_ATTEMPTS + 1):
+        # Each download is a new captcha, bound to this session's cookie
+        captcha = load_rgb_array(forms.download(page, "ContentPlaceHolder1_imgCaptcha"))
+        with log.solve_times.measure():
+            captcha_text = solve_captcha(captcha)
+        if not captcha_text:
+            status_print("Captcha unreadable, loading another", StatusLevel.WARNING)
+            if COLLECT_CAPTCHAS:
+                save_unlabelled_captcha(captcha, "unreadable")
+            continue
+        pending[page.element("ContentPlaceHolder1_txtCode")["name"]] = captcha_text
+        page.element("ContentPlaceHolder1_IWantToSympathetic")
+
+        # Past this point the report may have been accepted, so nothing falls back
+        try:
+            answer = forms.post(
+                page, pending, button="ContentPlaceHolder1_IWantToSympathetic"
+            )
+        except UnexpectedPageError as e:
+            raise Exception(f"Report submission failed: {e}")
+        if answer.has("ContentPlaceHolder1_Continue"):
+            log.record_report(attempt, True)
+            if COLLECT_CAPTCHAS:
+                save_captcha_sample(captcha, captcha_text)
+            return
+        if not answer.has("ContentPlaceHolder1_imgCaptcha"):
+            raise Exception("Report submission failed")
+
+        if COLLECT_CAPTCHAS:
+            save_unlabelled_captcha(captcha, "rejected", captcha_text)
+        status_print(
+            f"Captcha {captcha_text} rejected, attempt {attempt}/{CAPTCHA_MAX_ATTEMPTS}",
+            StatusLevel.WARNING,
+        )
+        page, pending = answer, {}
+
+    log.record_report(CAPTCHA_MAX_ATTEMPTS, False)
+    raise Exception("Report submission failed")
+
+
+def submit_over_http(personal_info, report_data) -> None:
+    """
+    Submit a report through the site's forms without a browser.
+
+    Raises UnexpectedPageError when the site strays from the known flow before
+    the report is sent, so the caller can submit it with a browser instead.
+
+    Args:
+        personal_info (object): Object containing the user's personal information
+        report_data (object): Object containing incident report data
+    """
+    started = time.perf_counter()
+    http = get_http_session()
+    http.cookies.clear()  # A new ASP.NET session per report, over warm connections
+    forms = FormSession(http)
+
+    page = _accept_terms(forms)
+    image_paths = [
+        os.path.abspath(path)
+        for path in report_data.image_paths or get_timestamped_jpeg_paths()
+    ]
+    page = _upload_images(forms, page, image_paths)
+
+    page, pending = forms.fill(
+        page,
+        {
+            "ContentPlaceHolder1_Name": personal_info.name,
+            "ContentPlaceHolder1_txtCardID": personal_info.ssn,
+            "ContentPlaceHolder1_ucsAddress_txtAddress": personal_info.home_address,
+            "ContentPlaceHolder1_EMail": personal_info.email,
+            "ContentPlaceHolder1_Phone": personal_info.phone,
+            "ContentPlaceHolder1_uscPlace_txtAddress": report_data.incident_address[
+                "formatted_address"
+            ],
+            "ContentPlaceHolder1_ViolationDate": report_data.incident_datetime,
+            "ContentPlaceHolder1_LicenseNo": report_data.licence_first,
+            "ContentPlaceHolder1_LicenseNo2": report_data.licence_second,
+            f"ContentPlaceHolder1_rblCarType_{report_data.vehicle_type}": True,
+            "ContentPlaceHolder1_Content": report_data.complaint_description,
+            "ContentPlaceHolder1_ViolationArea": report_data.police_station,
+            "ContentPlaceHolder1_ddlViolationEventCategory": report_data.category_parent,
+            "ContentPlaceHolder1_TitleDropDownList": report_data.category_child,
+        },
+    )
+
+    _submit(forms, page, pending)
+    status_print(
+        f"Submitted over HTTP in {time.perf_counter() - started:.1f}s "
+        f"({forms.requests} requests)",
+        StatusLevel.INFO,
+    )
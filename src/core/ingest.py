@@ -0,0 +1,207 @@
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config import INGEST_POLL_INTERVAL, INGEST_SETTLE_SECONDS, INPUT_DIR
+from src.data_handling.detection import get_detector
+from src.data_handling.input import SUPPORTED_EXTENSIONS
+from src.data_handling.processing import (
+    licence_recognition,
+    process_image,
+    warm_up_models,
+)
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+INGEST_OUTPUT_DIR = "watched"  # Under data/processed, apart from the report inputs
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Fall back to polling the input directory
+    FileSystemEventHandler = object
+    Observer = None
+
+
+def _is_photo(path: str) -> bool:
+    name = os.path.basename(path)
+    return not name.startswith(".") and name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+class _Debouncer:
+    """Holds back files until their size and mtime stop changing."""
+
+    def __init__(self, settle_seconds: float):
+        self.settle_seconds = settle_seconds
+        self._pending: Dict[str, Tuple[Tuple[int, int], float]] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, path: str) -> None:
+        """Marks a file as changed, restarting its settle window."""
+        if _is_photo(path):
+            with self._lock:
+                self._pending[path] = ((-1, -1), time.monotonic())
+
+    def ready(self) -> List[Tuple[str, Tuple[int, int]]]:
+        """Returns the pending files that have been stable for the settle window."""
+        now, settled = time.monotonic(), []
+        with self._lock:
+            for path, (signature, since) in list(self._pending.items()):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    del self._pending[path]
+                    continue
+
+                current = (stat.st_size, stat.st_mtime_ns)
+                if current != signature:
+                    self._pending[path] = (current, now)
+                elif stat.st_size > 0 and now - since >= self.settle_seconds:
+                    del self._pending[path]
+                    settled.append((path, current))
+        return settled
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards file system notifications to the debouncer."""
+
+    def __init__(self, debouncer: _Debouncer):
+        super().__init__()
+        self.debouncer = debouncer
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.debouncer.touch(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.debouncer.touch(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.debouncer.touch(event.dest_path)
+
+
+class IngestService:
+    """Watches the input directory and processes photos as they arrive."""
+
+    def __init__(
+        self,
+        input_dir: str = INPUT_DIR,
+        poll_interval: float = INGEST_POLL_INTERVAL,
+        settle_seconds: float = INGEST_SETTLE_SECONDS,
+    ):
+        self.input_dir = input_dir
+        self.poll_interval = poll_interval
+        self.debouncer = _Debouncer(settle_seconds)
+        self.work_queue: "queue.Queue[Optional[Tuple[str, Tuple[int, int]]]]" = (
+            queue.Queue()
+        )
+        # Versions queued or being processed; handled ones are dropped again
+        self._seen: Set[Tuple[str, Tuple[int, int]]] = set()
+        self._seen_lock = threading.Lock()
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._stop = threading.Event()
+
+    def _scan(self) -> None:
+        """Polls the directory, touching files that are new or have changed."""
+        try:
+            entries = list(os.scandir(self.input_dir))
+        except OSError:
+            return
+
+        snapshot = {}
+        for entry in entries:
+            if not entry.is_file() or not _is_photo(entry.path):
+                continue
+            stat = entry.stat()
+            snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            if self._snapshot.get(entry.path) != snapshot[entry.path]:
+                self.debouncer.touch(entry.path)
+        self._snapshot = snapshot
+
+    def _enqueue_settled(self) -> None:
+        for path, signature in self.debouncer.ready():
+            with self._seen_lock:
+                if (path, signature) in self._seen:
+                    continue
+                self._seen.add((path, signature))
+            self.work_queue.put((path, signature))
+
+    def _consume(self) -> None:
+        """Runs the preprocessing and recognition stages for queued photos."""
+        warm_up_models()
+
+        while True:
+            item = self.work_queue.get()
+            if item is None:
+                break
+
+            path = item[0]
+            started = time.monotonic()
+            try:
+                # Each photo is its own incident, so a later report run does
+                # not pick up watched photos from the shared processed directory
+                incident = os.path.join(
+                    INGEST_OUTPUT_DIR, os.path.splitext(os.path.basename(path))[0]
+                )
+                output_path = process_image(0, path, incident)
+                licence = licence_recognition([path])
+                plate = "-".join(licence) if licence else "not detected"
+                status_print(
+                    f"Ingested {os.path.basename(path)} -> {output_path} "
+                    f"(licence: {plate}, {time.monotonic() - started:.1f}s; "
+                    f"{get_detector().summary()})",
+                    StatusLevel.SUCCESS,
+                )
+            except Exception as e:
+                status_print(f"Error ingesting {path}: {e}", StatusLevel.ERROR)
+            finally:
+                with self._seen_lock:
+                    self._seen.discard(item)
+                self.work_queue.task_done()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        """
+        Watch the input directory until stopped or interrupted.
+
+        File system notifications are used when watchdog is installed,
+        otherwise the directory is rescanned every poll interval.
+        """
+        os.makedirs(self.input_dir, exist_ok=True)
+        consumer = threading.Thread(target=self._consume, daemon=True)
+        consumer.start()
+
+        observer = None
+        if Observer is not None:
+            observer = Observer()
+            observer.schedule(_EventHandler(self.debouncer), self.input_dir)
+            observer.start()
+        mode = "file system events" if observer is not None else "polling"
+        status_print(f"Watching {self.input_dir} ({mode})", StatusLevel.INFO)
+
+        try:
+            self._scan()  # Photos already waiting in the directory
+            while not self._stop.is_set():
+                if observer is None:
+                    self._scan()
+                self._enqueue_settled()
+                self._stop.wait(self.poll_interval)
+        except KeyboardInterrupt:
+            status_print("Stopping ingest...", StatusLevel.INFO)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self.work_queue.put(None)
+            consumer.join()
+
+
+def run_ingest() -> None:
+    """Run the continuous ingest mode until interrupted."""
+    IngestService().run()
@@ -1,21 +1,63 @@
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+import os
+from contextlib import nullcontext
+from typing import Optional, Tuple
+
+import numpy as np
+from selenium.common.exceptions import (
+    TimeoutException,
+    UnexpectedAlertPresentException,
+)
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.ui import WebDriverWait
 
+from src.config import (
+    CAPTCHA_MAX_ATTEMPTS,
+    COLLECT_CAPTCHAS,
+    POLICE_MAILBOX_URL,
+    REPORT_BACKEND,
+)
+from src.core.browser import get_browser_pool
+from src.core.http_report import UnexpectedPageError, submit_over_http
+from src.data_handling.captcha import (
+    get_captcha_log,
+    save_captcha_sample,
+    save_unlabelled_captcha,
+)
 from src.data_handling.input import get_timestamped_jpeg_paths
-from src.data_handling.processing import ocr
+from src.data_handling.processing import load_rgb_array, solve_captcha
 from src.utils.form import (
     click_element,
+    dismiss_alert,
+    fill_form,
     fill_text_field,
-    select_dropdown_field,
+    reset_wait_breakdown,
     upload_attachments,
-    wait_seconds,
+    wait_for_element,
+    wait_for_uploaded,
+    wait_summary,
+    wait_until,
 )
 from src.utils.ui import status_print, StatusLevel
 
+# Constants
+REPORT_BACKENDS = ("selenium", "http")
+
+# After a submit, the success page has a Continue button; a page still asking for
+# the captcha means it was rejected
+SUBMIT_OUTCOME_JS = """
+if (document.readyState !== "complete") return null;
+if (document.getElementById("ContentPlaceHolder1_Continue")) return "accepted";
+if (document.getElementById("ContentPlaceHolder1_txtCode")) return "rejected";
+return null;
+"""
+
+# Reloads only the captcha image; the server issues a new code with it
+REFRESH_CAPTCHA_JS = """
+const image = document.getElementById("ContentPlaceHolder1_imgCaptcha");
+const src = image.src.replace(/[?&]_refresh=\\d+$/, "");
+image.src = src + (src.includes("?") ? "&" : "?") + "_refresh=" + Date.now();
+"""
+
 
 def _accepting_terms(driver):
     """
@@ -27,12 +69,10 @@ def _accepting_terms(driver):
     # Remove status print - parent function will handle this
 
     # Navigate to the terms and conditions page
-    driver.get("https://policemail.kcg.gov.tw/Statement.aspx")
+    driver.get(f"{POLICE_MAILBOX_URL}/Statement.aspx")
 
     # Wait for page to load
-    WebDriverWait(driver, 10).until(
-        ec.presence_of_element_located((By.CSS_SELECTOR, "#ContentPlaceHolder1_chk1"))
-    )
+    wait_for_element(driver, "#ContentPlaceHolder1_chk1")
 
     # Click all required checkboxes to accept terms
     click_element(driver, "#ContentPlaceHolder1_chk1")
@@ -41,12 +81,10 @@ def _accepting_terms(driver):
     click_element(driver, "#ContentPlaceHolder1_chk4")
 
     # Proceed to the next page
-    click_element(driver, "#ContentPlaceHolder1_IWantToReport")
+    click_element(driver, "#ContentPlaceHolder1_IWantToReport", navigates=True)
 
     # Wait for the next page to load by checking for the name field
-    WebDriverWait(driver, 10).until(
-        ec.presence_of_element_located((By.CSS_SELECTOR, "#ContentPlaceHolder1_Name"))
-    )
+    wait_for_element(driver, "#ContentPlaceHolder1_Name")
 
 
 def _fill_personal_info(driver, personal_info):
@@ -59,14 +97,17 @@ def _fill_personal_info(driver, personal_info):
     """
     # Remove status print - parent function will handle this
 
-    # Fill all personal info fields without individual status updates
-    fill_text_field(driver, "#ContentPlaceHolder1_Name", personal_info.name)
-    fill_text_field(driver, "#ContentPlaceHolder1_txtCardID", personal_info.ssn)
-    fill_text_field(
-        driver, "#ContentPlaceHolder1_ucsAddress_txtAddress", personal_info.home_address
+    # Fill all personal info fields in one go without individual status updates
+    fill_form(
+        driver,
+        {
+            "#ContentPlaceHolder1_Name": personal_info.name,
+            "#ContentPlaceHolder1_txtCardID": personal_info.ssn,
+            "#ContentPlaceHolder1_ucsAddress_txtAddress": personal_info.home_address,
+            "#ContentPlaceHolder1_EMail": personal_info.email,
+            "#ContentPlaceHolder1_Phone": personal_info.phone,
+        },
     )
-    fill_text_field(driver, "#ContentPlaceHolder1_EMail", personal_info.email)
-    fill_text_field(driver, "#ContentPlaceHolder1_Phone", personal_info.phone)
 
 
 def _fill_incident_details(driver, report_data):
@@ -79,109 +120,188 @@ def _fill_incident_details(driver, report_data):
         report_data (object): Object containing incident report data
     """
     # Remove individual status prints for each form section
-    image_paths = get_timestamped_jpeg_paths()
+    image_paths = [
+        os.path.abspath(path)
+        for path in report_data.image_paths or get_timestamped_jpeg_paths()
+    ]
     upload_attachments(driver, "#ContentPlaceHolder1_fl_File", image_paths)
     click_element(driver, "#ContentPlaceHolder1_btnMailFile")
-    wait_seconds(driver, 5)
+    if not wait_for_uploaded(driver, [os.path.basename(path) for path in image_paths]):
+        status_print("Uploaded files are not listed on the page", StatusLevel.WARNING)
 
-    # Fill location
-    fill_text_field(
+    # Fill location, time, vehicle information and violation details; the
+    # violation category must be posted back before its titles can be chosen
+    fill_form(
         driver,
-        "#ContentPlaceHolder1_uscPlace_txtAddress",
-        report_data.incident_address["formatted_address"],
+        {
+            "#ContentPlaceHolder1_uscPlace_txtAddress": report_data.incident_address[
+                "formatted_address"
+            ],
+            "#ContentPlaceHolder1_ViolationDate": report_data.incident_datetime,
+            "#ContentPlaceHolder1_LicenseNo": report_data.licence_first,
+            "#ContentPlaceHolder1_LicenseNo2": report_data.licence_second,
+            f"#ContentPlaceHolder1_rblCarType_{report_data.vehicle_type}": True,
+            "#ContentPlaceHolder1_Content": report_data.complaint_description,
+            "#ContentPlaceHolder1_ViolationArea": report_data.police_station,
+            "#ContentPlaceHolder1_ddlViolationEventCategory": report_data.category_parent,
+            "#ContentPlaceHolder1_TitleDropDownList": report_data.category_child,
+        },
     )
 
-    # Fill time
-    fill_text_field(
-        driver, "#ContentPlaceHolder1_ViolationDate", report_data.incident_datetime
-    )
 
-    # Fill vehicle information
-    fill_text_field(driver, "#ContentPlaceHolder1_LicenseNo", report_data.licence_first)
-    fill_text_field(
-        driver, "#ContentPlaceHolder1_LicenseNo2", report_data.licence_second
-    )
-    click_element(driver, f"#ContentPlaceHolder1_rblCarType_{report_data.vehicle_type}")
-
-    # Fill violation details
-    # Use JavaScript to fill the multiline text field
-    driver.execute_script(
-        'document.querySelector("#ContentPlaceHolder1_Content").value = arguments[0]',
-        report_data.complaint_description,
-    )
-    select_dropdown_field(
-        driver, "#ContentPlaceHolder1_ViolationArea", report_data.police_station
-    )
-    select_dropdown_field(
+def _read_captcha(driver) -> Tuple[WebElement, np.ndarray]:
+    """
+    Read the rendered captcha from the browser itself, so it is the image bound
+    to this session and never touches the network or disk again.
+    """
+    captcha_img = wait_for_element(driver, "#ContentPlaceHolder1_imgCaptcha")
+    wait_until(
         driver,
-        "#ContentPlaceHolder1_ddlViolationEventCategory",
-        report_data.category_parent,
-    )
-    select_dropdown_field(
-        driver, "#ContentPlaceHolder1_TitleDropDownList", report_data.category_child
+        lambda d: d.execute_script(
+            "return arguments[0].complete && arguments[0].naturalWidth > 0",
+            captcha_img,
+        ),
+        "element",
     )
+    return captcha_img, load_rgb_array(captcha_img.screenshot_as_png)
+
+
+def _send_answer(driver, captcha_img: WebElement) -> Optional[str]:
+    """
+    Submit the form and wait for the site's answer: a new page, or an alert.
+
+    A slow answer is waited for with the postback budget rather than taken as
+    a rejection, since submitting again could file the report twice.
+
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance
+        captcha_img (WebElement): The captcha of the page being submitted
+
+    Returns:
+        Optional[str]: The alert's text if the answer was one, else None
+    """
+    try:
+        click_element(driver, "#ContentPlaceHolder1_IWantToSympathetic", navigates=True)
+    except UnexpectedAlertPresentException as e:
+        # The driver may have closed the alert already; its text comes with the error
+        return dismiss_alert(driver) or e.alert_text or ""
+    except TimeoutException:
+        try:
+            wait_until(
+                driver,
+                lambda d: ec.alert_is_present()(d) or ec.staleness_of(captcha_img)(d),
+                "postback",
+            )
+        except TimeoutException:
+            raise Exception("Report submission failed: no answer to the submit")
+    return dismiss_alert(driver)
 
 
 def _submit_report(driver):
     """
-    Submit the report form.
+    Submit the report form, retrying a rejected captcha in place.
+
+    A rejected captcha leaves the form filled in and the attachments uploaded,
+    so only the captcha is solved again, up to CAPTCHA_MAX_ATTEMPTS times. A
+    submit the site never answers fails instead, as it may have gone through.
 
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance
     """
-    # Remove intermediate status prints
-    captcha_img = WebDriverWait(driver, 5).until(
-        ec.presence_of_element_located(
-            (By.CSS_SELECTOR, "#ContentPlaceHolder1_imgCaptcha")
+    log = get_captcha_log()
+    for attempt in range(1, CAPTCHA_MAX_ATTEMPTS + 1):
+        captcha_img, captcha = _read_captcha(driver)
+        with log.solve_times.measure():
+            captcha_text = solve_captcha(captcha)
+        if not captcha_text:
+            status_print("Captcha unreadable, loading another", StatusLevel.WARNING)
+            if COLLECT_CAPTCHAS:
+                save_unlabelled_captcha(captcha, "unreadable")
+            driver.execute_script(REFRESH_CAPTCHA_JS)
+            continue
+        fill_text_field(driver, "#ContentPlaceHolder1_txtCode", captcha_text)
+
+        message = _send_answer(driver, captcha_img)
+        try:
+            outcome = wait_until(
+                driver, lambda d: d.execute_script(SUBMIT_OUTCOME_JS), "element"
+            )
+        except Exception:
+            raise Exception("Report submission failed")
+
+        if outcome == "accepted":
+            log.record_report(attempt, True)
+            if COLLECT_CAPTCHAS:
+                save_captcha_sample(captcha, captcha_text)
+            return
+        if COLLECT_CAPTCHAS:
+            save_unlabelled_captcha(captcha, "rejected", captcha_text)
+        if not ec.staleness_of(captcha_img)(driver):  # Rejected without a new page
+            driver.execute_script(REFRESH_CAPTCHA_JS)
+        status_print(
+            f"Captcha {captcha_text} rejected{f' ({message})' if message else ''}, "
+            f"attempt {attempt}/{CAPTCHA_MAX_ATTEMPTS}",
+            StatusLevel.WARNING,
         )
-    )
 
-    img_src = captcha_img.get_attribute("src")
-    captcha_text = ocr(requests.compat.urljoin(driver.current_url, img_src))
-    fill_text_field(driver, "#ContentPlaceHolder1_txtCode", captcha_text)
+    log.record_report(CAPTCHA_MAX_ATTEMPTS, False)
+    raise Exception("Report submission failed")
 
-    # Click submit
-    click_element(driver, "#ContentPlaceHolder1_IWantToSympathetic")
-    wait_seconds(driver, 5)
 
-    # Check for successful submission by looking for the Continue button
-    try:
-        WebDriverWait(driver, 10).until(
-            ec.presence_of_element_located(
-                (By.CSS_SELECTOR, "#ContentPlaceHolder1_Continue")
-            )
+def check_report_backend() -> None:
+    """Rejects an unknown REPORT_BACKEND before any photo is processed."""
+    if REPORT_BACKEND not in REPORT_BACKENDS:
+        raise ValueError(
+            f"REPORT_BACKEND={REPORT_BACKEND}: "
+            f"expected one of {', '.join(REPORT_BACKENDS)}"
         )
-    except:
-        raise Exception("Report submission failed")
 
 
-def auto_report(personal_info, report_data):
+def auto_report(personal_info, report_data, driver=None):
     """
     Automate the entire reporting process from start to finish.
 
+    With REPORT_BACKEND=http the forms are submitted over plain HTTP, and a
+    browser is only used if the site shows a page that flow does not expect.
+
     Args:
         personal_info (object): Object containing the user's personal information
         report_data (object): Object containing incident report data
+        driver (webdriver.Chrome): Browser session to use; a clean one is taken
+            from the browser pool and returned to it afterwards when omitted
 
     Returns:
         bool: True if the report was submitted successfully, False otherwise
     """
     status_print("Submitting report to authorities...", StatusLevel.INFO)
-    chrome_options = Options()
-    driver = webdriver.Chrome(options=chrome_options)
-
-    try:
-        _accepting_terms(driver)
-        _fill_personal_info(driver, personal_info)
-        _fill_incident_details(driver, report_data)
-        _submit_report(driver)
-        status_print("Report submitted successfully", StatusLevel.SUCCESS)
-
-    except Exception as e:
-        status_print(f"Error during reporting: {e}", StatusLevel.ERROR)
-        raise e
-
-    finally:
-        # Clean up
-        wait_seconds(driver, 30)
-        driver.quit()
+    if REPORT_BACKEND == "http" and driver is None:
+        try:
+            submit_over_http(personal_info, report_data)
+            status_print("Report submitted successfully", StatusLevel.SUCCESS)
+            return
+        except UnexpectedPageError as e:
+            status_print(
+                f"Unexpected page over HTTP, retrying in a browser: {e}",
+                StatusLevel.WARNING,
+            )
+        except Exception as e:
+            status_print(f"Error during reporting: {e}", StatusLevel.ERROR)
+            raise e
+
+    reset_wait_breakdown()
+    session = get_browser_pool().session() if driver is None else nullcontext(driver)
+
+    with session as driver:
+        try:
+            _accepting_terms(driver)
+            _fill_personal_info(driver, personal_info)
+            _fill_incident_details(driver, report_data)
+            _submit_report(driver)
+            status_print("Report submitted successfully", StatusLevel.SUCCESS)
+
+        except Exception as e:
+            status_print(f"Error during reporting: {e}", StatusLevel.ERROR)
+            raise e
+
+        finally:
+            status_print(f"Form {wait_summary()}", StatusLevel.INFO)
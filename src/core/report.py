@@ -1,9 +1,23 @@
-from src.data_handling.processing import preprocess_img
+from typing import Dict, List
+
+from src.config import REPORT_BACKEND
+from src.data_handling.captcha import get_captcha_log
+from src.data_handling.clustering import cluster_incidents
+from src.data_handling.detection import get_detector
+from src.data_handling.recognition import get_ocr_engine
+from src.data_handling.input import get_incident_names, get_source_paths
+from src.data_handling.processing import (
+    preprocess_img,
+    preprocess_incidents,
+    recognize_licences,
+    warm_up_models,
+)
 from src.data_handling.schemas import prepare_data
+from src.core.browser import get_browser_pool
 from src.core.procedure import auto_report
 from src.utils.ui import status_print, StatusLevel
 from src.utils.mail import process_email
-from src.data_handling.output import clear_IO
+from src.data_handling.output import clear_IO, clear_incident
 
 
 def kaohsiung_auto_report() -> None:
@@ -11,8 +25,11 @@ def kaohsiung_auto_report() -> None:
         status_print("Starting automated report process", StatusLevel.INFO)
 
         # Let the functions handle their own status messages
-        preprocess_img()
-        (personal_info, report_data) = prepare_data()
+        image_paths = preprocess_img()
+        if REPORT_BACKEND == "selenium":
+            get_browser_pool().start()  # Launched after forking workers, warm by submit
+        warm_up_models()
+        (personal_info, report_data) = prepare_data(image_paths=image_paths)
         auto_report(personal_info, report_data)
         process_email()
         clear_IO()
@@ -20,3 +37,80 @@ def kaohsiung_auto_report() -> None:
         status_print("Report process completed successfully!", StatusLevel.SUCCESS)
     except Exception as e:
         status_print(f"Error in reporting process: {e}", StatusLevel.ERROR)
+
+
+def _collect_incidents() -> Dict[str, List[str]]:
+    """
+    Collect the source photos of each incident.
+
+    Each subdirectory of data/original is one incident; photos dumped directly
+    into data/original are grouped into incidents by capture time and GPS.
+    """
+    incidents = {name: get_source_paths(name) for name in get_incident_names()}
+    for i, group in enumerate(cluster_incidents(get_source_paths())):
+        incidents[f"cluster_{i}"] = group
+    return {name: paths for name, paths in incidents.items() if paths}
+
+
+def kaohsiung_batch_report() -> None:
+    """
+    Report every incident found in data/original in one run.
+
+    All incidents are preprocessed and confirmed up front, then submitted
+    through warm pooled browser sessions and verified over a single IMAP
+    session.
+    """
+    try:
+        incidents = _collect_incidents()
+        status_print(f"Starting batch report of {len(incidents)} incident(s)")
+
+        outputs = preprocess_incidents(incidents)
+        if REPORT_BACKEND == "selenium":
+            get_browser_pool().start()  # Launched after forking workers, warm by submit
+        warm_up_models()
+        try:
+            # One batched detection pass for all incidents
+            recognize_licences(incidents)
+            recognize = True
+        except Exception as e:
+            status_print(
+                f"Licence recognition failed, plates will be asked for: {e}",
+                StatusLevel.WARNING,
+            )
+            recognize = False
+        reports = []
+        for incident, source_paths in incidents.items():
+            status_print(f"Incident: {incident}", StatusLevel.INFO)
+            try:
+                prepared = prepare_data(source_paths, outputs[incident], recognize)
+            except ValueError as e:
+                status_print(f"Skipping incident {incident}: {e}", StatusLevel.ERROR)
+                continue
+            if prepared:
+                reports.append((incident, prepared))
+
+        submitted = 0
+        for incident, (personal_info, report_data) in reports:
+            try:
+                auto_report(personal_info, report_data)
+                submitted += 1
+                # Never resubmitted on a re-run
+                clear_incident(incident, incidents[incident])
+            except Exception as e:
+                status_print(f"Skipping incident {incident}: {e}", StatusLevel.ERROR)
+
+        status_print(get_browser_pool().summary())
+        status_print(get_detector().summary())
+        status_print(get_ocr_engine().summary())
+        status_print(get_captcha_log().summary())
+        if submitted:
+            process_email(expected=submitted)
+        if submitted == len(incidents):
+            clear_IO()
+
+        status_print(
+            f"Batch completed: {submitted}/{len(incidents)} report(s) submitted",
+            StatusLevel.SUCCESS if submitted == len(incidents) else StatusLevel.WARNING,
+        )
+    except Exception as e:
+        status_print(f"Error in batch reporting process: {e}", StatusLevel.ERROR)
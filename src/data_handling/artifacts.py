@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional
+
+from src.config import ARTIFACT_DIR, ARTIFACT_MAX_AGE_DAYS, ARTIFACT_MAX_BYTES
+
+# Constants
+HASH_CHUNK_SIZE = 1 << 20
+JSON_EXTENSION = ".json"
+
+_digests: Dict[str, str] = {}
+
+
+def file_digest(file_path: str) -> str:
+    """Returns the SHA-256 of a file's contents, memoized by path, size and mtime."""
+    stat = os.stat(file_path)
+    memo_key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    if memo_key not in _digests:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        _digests[memo_key] = digest.hexdigest()
+    return _digests[memo_key]
+
+
+def artifact_key(source_digest: str, stage: str, params: Dict[str, Any]) -> str:
+    """Derives the key of a stage output from its input digest and parameters."""
+    payload = json.dumps(
+        {"source": source_digest, "stage": stage, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _artifact_path(key: str, suffix: str) -> str:
+    return os.path.join(ARTIFACT_DIR, key[:2], f"{key}{suffix}")
+
+
+def get_artifact(key: str, suffix: str) -> Optional[str]:
+    """Returns the stored artifact path for a key, refreshing its age, if present."""
+    path = _artifact_path(key, suffix)
+    if not os.path.exists(path):
+        return None
+    os.utime(path)
+    return path
+
+
+def put_artifact(key: str, suffix: str, file_path: str) -> str:
+    """Stores a copy of a finished stage output under its key."""
+    path = _artifact_path(key, suffix)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.copyfile(file_path, temp_path)
+    os.replace(temp_path, path)
+    return path
+
+
+def get_json_artifact(key: str) -> Optional[Any]:
+    """Loads a JSON stage result, if present."""
+    path = get_artifact(key, JSON_EXTENSION)
+    if path is None:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def put_json_artifact(key: str, value: Any) -> str:
+    """Stores a JSON-serializable stage result under its key."""
+    path = _artifact_path(key, JSON_EXTENSION)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+    return path
+
+
+def evict_artifacts(
+    max_bytes: int = ARTIFACT_MAX_BYTES, max_age_days: float = ARTIFACT_MAX_AGE_DAYS
+) -> int:
+    """
+    Evict artifacts older than the age limit, then least recently used ones
+    until the store fits within the size limit.
+
+    Args:
+        max_bytes (int): Maximum total size of the store
+        max_age_days (float): Maximum age since an artifact was last used
+
+    Returns:
+        int: Number of artifacts removed
+    """
+    entries = []
+    for root, _, files in os.walk(ARTIFACT_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    cutoff = time.time() - max_age_days * 86400
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in sorted(entries):
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,266 @@
+import importlib.util
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.config import CAPTCHA_CORPUS_DIR
+from src.utils.latency import LatencyStats
+
+# Constants
+CAPTCHA_MODEL = "assets/models/captcha_crnn.onnx"
+CAPTCHA_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+CAPTCHA_INPUT_SIZE = (32, 128)  # Used when the model input shape is dynamic
+# Captchas the website turned down, or that OCR could not read at all; their
+# true text is only known once labelled by hand
+FAILED_ORIGINS = ("rejected", "unreadable")
+UNLABELLED_DIR = os.path.join(CAPTCHA_CORPUS_DIR, "unlabelled")
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def decode_ctc(probs: np.ndarray, charset: str = CAPTCHA_CHARSET) -> Tuple[str, float]:
+    """
+    Greedy CTC decoding of per-step class probabilities (index 0 is the blank).
+
+    Args:
+        probs (np.ndarray): Probabilities of shape (steps, len(charset) + 1)
+        charset (str): Characters for the non-blank classes
+
+    Returns:
+        Tuple[str, float]: Decoded text and the lowest probability of its characters
+    """
+    best = probs.argmax(axis=-1)
+    keep = (best != 0) & np.append(True, best[1:] != best[:-1])
+    if not keep.any():
+        return "", 0.0
+    text = "".join(charset[i - 1] for i in best[keep])
+    return text, float(probs[keep, best[keep]].min())
+
+
+class CaptchaRecognizer:
+    """Small CRNN for the report form captcha, run through an ONNX Runtime session."""
+
+    def __init__(self, model_path: str = CAPTCHA_MODEL, charset: str = CAPTCHA_CHARSET):
+        self.model_path = model_path
+        self.charset = charset
+        self.timings = LatencyStats()
+        self._session = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether ONNX Runtime and the model are present, checked without importing."""
+        return (
+            os.path.exists(self.model_path)
+            and importlib.util.find_spec("onnxruntime") is not None
+        )
+
+    def _get_session(self):
+        """Opens the ONNX Runtime session on first use; callers must hold the lock."""
+        if self._session is None:
+            with self.timings.measure_load():
+                import onnxruntime as ort
+
+                options = ort.SessionOptions()
+                options.intra_op_num_threads = 1
+                self._session = ort.InferenceSession(
+                    self.model_path, options, providers=["CPUExecutionProvider"]
+                )
+        return self._session
+
+    def _prepare(self, image: np.ndarray, input_shape: List) -> np.ndarray:
+        """Scales an RGB captcha to the model input as a normalized NCHW tensor."""
+        channels, height, width = input_shape[1:]
+        height = height if isinstance(height, int) else CAPTCHA_INPUT_SIZE[0]
+        width = width if isinstance(width, int) else CAPTCHA_INPUT_SIZE[1]
+        mode = "RGB" if channels == 3 else "L"
+        resized = Image.fromarray(image).convert(mode).resize((width, height))
+        pixels = np.asarray(resized, dtype=np.float32) / 255.0
+        if pixels.ndim == 2:
+            pixels = pixels[np.newaxis]
+        else:
+            pixels = pixels.transpose(2, 0, 1)
+        return pixels[np.newaxis]
+
+    def warm_up(self) -> None:
+        """Creates the session and runs one blank inference."""
+        self.predict(np.full((*CAPTCHA_INPUT_SIZE, 3), 255, dtype=np.uint8))
+
+    def predict(self, image: np.ndarray) -> Tuple[str, float]:
+        """
+        Read a captcha image.
+
+        Args:
+            image (np.ndarray): RGB captcha image
+
+        Returns:
+            Tuple[str, float]: Text and the lowest per-character confidence
+        """
+        with self._lock:
+            session = self._get_session()
+            model_input = session.get_inputs()[0]
+            tensor = self._prepare(image, model_input.shape)
+            with self.timings.measure():
+                output = session.run(None, {model_input.name: tensor})[0]
+
+        scores = output[0]
+        if not np.allclose(scores.sum(axis=-1), 1.0, atol=1e-3):
+            scores = _softmax(scores)
+        return decode_ctc(scores, self.charset)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        return self.timings.stats()
+
+    def summary(self) -> str:
+        return self.timings.summary("captcha recognizer")
+
+
+_recognizer: Optional[CaptchaRecognizer] = None
+_recognizer_lock = threading.Lock()
+
+
+def get_captcha_recognizer() -> CaptchaRecognizer:
+    """Return the process-wide captcha recognizer."""
+    global _recognizer
+    with _recognizer_lock:
+        if _recognizer is None:
+            _recognizer = CaptchaRecognizer()
+        return _recognizer
+
+
+class CaptchaLog:
+    """Submission attempts and solve times of the captchas of submitted reports."""
+
+    def __init__(self):
+        self.reports = 0
+        self.accepted = 0
+        self.attempts = 0
+        self.solve_times = LatencyStats()
+        self._lock = threading.Lock()
+
+    def record_report(self, attempts: int, accepted: bool) -> None:
+        """Records how many captchas one report submitted and whether it got through."""
+        with self._lock:
+            self.reports += 1
+            self.accepted += accepted
+            self.attempts += attempts
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        solve_times = self.solve_times.stats()
+        with self._lock:
+            return {
+                "reports": self.reports,
+                "accepted": self.accepted,
+                "attempts": self.attempts,
+                "mean_solve_time": solve_times["mean_latency"],
+                "max_solve_time": solve_times["max_latency"],
+            }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        if not stats["reports"]:
+            return "no captchas submitted"
+        summary = (
+            f"captchas: {stats['accepted']}/{stats['reports']} report(s) accepted "
+            f"after {stats['attempts']} attempt(s)"
+        )
+        if stats["mean_solve_time"] is not None:
+            summary += (
+                f", solved in mean {stats['mean_solve_time'] * 1000:.0f} ms, "
+                f"max {stats['max_solve_time'] * 1000:.0f} ms"
+            )
+        return summary
+
+
+_log = CaptchaLog()
+
+
+def get_captcha_log() -> CaptchaLog:
+    """Return the process-wide captcha attempt log."""
+    return _log
+
+
+def _stamp() -> str:
+    return datetime.now().strftime("%Y%m%d%H%M%S%f")
+
+
+def save_captcha_sample(image: np.ndarray, label: str) -> str:
+    """Adds a captcha the website accepted to the labelled corpus."""
+    os.makedirs(CAPTCHA_CORPUS_DIR, exist_ok=True)
+    path = os.path.join(CAPTCHA_CORPUS_DIR, f"{label}_{_stamp()}_accepted.png")
+    Image.fromarray(image).save(path)
+    return path
+
+
+def save_unlabelled_captcha(
+    image: np.ndarray, origin: str, guess: Optional[str] = None
+) -> str:
+    """
+    Keeps a rejected or unreadable captcha until it is labelled by hand.
+
+    Args:
+        image: The captcha as an RGB array
+        origin: "rejected" or "unreadable"
+        guess: The rejected answer, shown when labelling
+
+    Returns:
+        str: Path of the saved image, <origin>_<time>[_<guess>].png
+    """
+    if origin not in FAILED_ORIGINS:
+        raise ValueError(f"save_unlabelled_captcha(): Unknown origin {origin}")
+    os.makedirs(UNLABELLED_DIR, exist_ok=True)
+    guess = "".join(c for c in guess or "" if c.isalnum())  # Safe in a file name
+    name = f"{origin}_{_stamp()}{f'_{guess}' if guess else ''}.png"
+    path = os.path.join(UNLABELLED_DIR, name)
+    Image.fromarray(image).save(path)
+    return path
+
+
+def load_unlabelled_captchas(
+    unlabelled_dir: str = UNLABELLED_DIR,
+) -> List[Tuple[str, str, Optional[str]]]:
+    """Lists (path, origin, guess) of the captchas waiting for a label."""
+    if not os.path.isdir(unlabelled_dir):
+        return []
+    samples = []
+    for name in sorted(os.listdir(unlabelled_dir)):
+        if not name.lower().endswith(".png") or name.startswith("."):
+            continue
+        parts = os.path.splitext(name)[0].split("_")
+        guess = parts[2] if len(parts) > 2 else None
+        samples.append((os.path.join(unlabelled_dir, name), parts[0], guess))
+    return samples
+
+
+def label_captcha(path: str, origin: str, label: str) -> str:
+    """Moves an unlabelled captcha into the corpus under its hand-read label."""
+    target = os.path.join(CAPTCHA_CORPUS_DIR, f"{label}_{_stamp()}_{origin}.png")
+    os.replace(path, target)
+    return target
+
+
+def load_captcha_corpus(
+    corpus_dir: str = CAPTCHA_CORPUS_DIR,
+) -> List[Tuple[str, str, str]]:
+    """
+    Lists (path, label, origin) of the corpus, taken from the file names.
+
+    Files named <label>_<time>.png predate the origin suffix and were all
+    accepted by the website.
+    """
+    if not os.path.isdir(corpus_dir):
+        return []
+    samples = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if not name.lower().endswith(".png") or name.startswith("."):
+            continue
+        parts = os.path.splitext(name)[0].split("_")
+        origin = parts[2] if len(parts) > 2 else "accepted"
+        samples.append((os.path.join(corpus_dir, name), parts[0], origin))
+    return samples
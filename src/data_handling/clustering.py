@@ -0,0 +1,79 @@
+import os
+from datetime import datetime
+from typing import List
+
+import numpy as np
+
+from src.config import INCIDENT_MAX_DISTANCE_M, INCIDENT_MAX_GAP_MINUTES
+from src.data_handling.metadata import get_metadata_batch
+
+# Constants
+EARTH_RADIUS_M = 6371000.0
+
+
+def _haversine(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """Great-circle distances in meters between paired coordinates (NaN if unknown)."""
+    lat1, lon1, lat2, lon2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def cluster_incidents(
+    file_paths: List[str],
+    max_gap_minutes: float = INCIDENT_MAX_GAP_MINUTES,
+    max_distance_m: float = INCIDENT_MAX_DISTANCE_M,
+) -> List[List[str]]:
+    """
+    Group photos into incidents by capture time and GPS position.
+
+    Photos are ordered by capture time and a new incident starts wherever
+    consecutive photos are further apart than either threshold. Photos
+    without GPS are only split by time.
+
+    Args:
+        file_paths (List[str]): Photos to group
+        max_gap_minutes (float): Largest time gap within one incident
+        max_distance_m (float): Largest distance between consecutive photos
+
+    Returns:
+        List[List[str]]: Photo paths per incident, each in capture order
+    """
+    if not file_paths:
+        return []
+
+    metadata = get_metadata_batch(file_paths)
+    times = np.array(
+        [
+            (
+                datetime.fromisoformat(m.captured_at).timestamp()
+                if m.captured_at
+                else os.path.getmtime(path)
+            )
+            for path, m in zip(file_paths, metadata)
+        ],
+        dtype=np.float64,
+    )
+    coords = np.array(
+        [
+            (m.latitude, m.longitude) if m.has_gps else (np.nan, np.nan)
+            for m in metadata
+        ],
+        dtype=np.float64,
+    )
+
+    order = np.argsort(times, kind="stable")
+    times, coords = times[order], coords[order]
+    gaps = np.diff(times) > max_gap_minutes * 60
+    with np.errstate(invalid="ignore"):
+        jumps = (
+            _haversine(coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1])
+            > max_distance_m
+        )
+
+    boundaries = np.flatnonzero(gaps | jumps) + 1
+    return [[file_paths[i] for i in group] for group in np.split(order, boundaries)]
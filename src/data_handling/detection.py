@@ -0,0 +1,256 @@
+import itertools
+import os
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.config import DETECTION_BATCH_SIZE, DETECTION_MODEL_VARIANT
+from src.utils.latency import LatencyStats
+from src.utils.ui import status_print, StatusLevel
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+# Constants
+LICENCE_MODELS = {
+    "fp32": "assets/models/yolo12m_licence.onnx",
+    "optimized": "assets/models/yolo12m_licence_optimized.onnx",
+    "int8": "assets/models/yolo12m_licence_int8.onnx",
+}
+DETECTION_CONFIDENCE = 0.4
+DETECTION_IMAGE_SIZE = 640
+# Unknown variants are reported by check_detection_model() at startup
+LICENCE_MODEL = LICENCE_MODELS.get(DETECTION_MODEL_VARIANT, LICENCE_MODELS["fp32"])
+
+
+def check_detection_model() -> None:
+    """
+    Validate the configured plate model before any photo is processed.
+
+    An unknown DETECTION_MODEL_VARIANT is a configuration error and raises
+    ValueError; a missing model file only disables plate recognition, so it
+    is reported as a warning.
+    """
+    if DETECTION_MODEL_VARIANT not in LICENCE_MODELS:
+        raise ValueError(
+            f"DETECTION_MODEL_VARIANT={DETECTION_MODEL_VARIANT}: "
+            f"expected one of {', '.join(LICENCE_MODELS)}"
+        )
+    if not os.path.isfile(LICENCE_MODEL):
+        status_print(
+            f"{_missing_model(LICENCE_MODEL)}, plates will be asked for",
+            StatusLevel.WARNING,
+        )
+
+
+def _missing_model(model_path: str) -> str:
+    """Describes a missing plate model and how to get it."""
+    if model_path == LICENCE_MODELS["fp32"]:
+        return f"Plate model {model_path} not found"
+    return (
+        f"Plate model {model_path} not found, "
+        "export it with python -m src.tools.quantize_detector"
+    )
+
+
+@dataclass
+class PlateDetection:
+    """A detected plate: its box in pixels of an image of image_size, and RGB crop."""
+
+    box: Tuple[float, float, float, float]
+    confidence: float
+    crop: np.ndarray
+    image_size: Tuple[int, int]
+
+
+def crop_box(pixels: np.ndarray, box: Tuple[float, float, float, float]) -> np.ndarray:
+    """Crops an (x1, y1, x2, y2) box out of an image array, clamped to its bounds."""
+    height, width = pixels.shape[:2]
+    x1, y1 = max(int(box[0]), 0), max(int(box[1]), 0)
+    x2, y2 = min(int(np.ceil(box[2])), width), min(int(np.ceil(box[3])), height)
+    return pixels[y1:y2, x1:x2].copy()
+
+
+def scale_box(
+    box: Tuple[float, float, float, float],
+    from_size: Tuple[int, int],
+    to_size: Tuple[int, int],
+    margin: float = 0.0,
+) -> Tuple[float, float, float, float]:
+    """
+    Map a box between two resolutions of the same image, optionally widened.
+
+    Args:
+        box (Tuple[float, float, float, float]): (x1, y1, x2, y2) box
+        from_size (Tuple[int, int]): (width, height) the box is measured in
+        to_size (Tuple[int, int]): (width, height) to map the box to
+        margin (float): Fraction of the box size to add on every side
+
+    Returns:
+        Tuple[float, float, float, float]: The box in to_size pixels
+    """
+    scale_x, scale_y = to_size[0] / from_size[0], to_size[1] / from_size[1]
+    x1, y1, x2, y2 = box
+    pad_x, pad_y = (x2 - x1) * margin, (y2 - y1) * margin
+    return (
+        (x1 - pad_x) * scale_x,
+        (y1 - pad_y) * scale_y,
+        (x2 + pad_x) * scale_x,
+        (y2 + pad_y) * scale_y,
+    )
+
+
+def _to_detections(image: Image.Image, result) -> List[PlateDetection]:
+    """Converts a YOLO result into detections ranked by confidence."""
+    pixels = np.asarray(image)
+    detections = [
+        PlateDetection(
+            tuple(float(v) for v in box),
+            float(conf),
+            crop_box(pixels, box),
+            image.size,
+        )
+        for box, conf in zip(
+            result.boxes.xyxy.cpu().numpy(), result.boxes.conf.cpu().numpy()
+        )
+    ]
+    return sorted(detections, key=lambda d: d.confidence, reverse=True)
+
+
+class LicencePlateDetector:
+    """Licence plate detector that loads its model once and is shared across calls."""
+
+    def __init__(
+        self, model_path: str = LICENCE_MODEL, conf: float = DETECTION_CONFIDENCE
+    ):
+        self.model_path = model_path
+        self.conf = conf
+        self.timings = LatencyStats()
+        self._model: Optional["YOLO"] = None
+        self._static_batch: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_model(self) -> "YOLO":
+        """Imports and loads the model on first use; callers must hold the lock."""
+        if self._model is None:
+            if not os.path.isfile(self.model_path):
+                raise FileNotFoundError(_missing_model(self.model_path))
+            with self.timings.measure_load():
+                from ultralytics import YOLO
+
+                self._model = YOLO(self.model_path, task="detect", verbose=False)
+                self._static_batch = self._read_static_batch()
+        return self._model
+
+    def _read_static_batch(self) -> Optional[int]:
+        """The batch size an ONNX export is fixed to, or None if it takes any."""
+        if not self.model_path.endswith(".onnx"):
+            return None
+        import onnxruntime as ort
+
+        # Only the input shape is read, so skip optimizing the graph
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        session = ort.InferenceSession(
+            self.model_path, options, providers=["CPUExecutionProvider"]
+        )
+        batch = session.get_inputs()[0].shape[0]
+        return batch if isinstance(batch, int) else None
+
+    def warm_up(self) -> None:
+        """Loads the model and runs one blank inference to initialize the session."""
+        blank = np.zeros(
+            (DETECTION_IMAGE_SIZE, DETECTION_IMAGE_SIZE, 3), dtype=np.uint8
+        )
+        with self._lock:
+            self._get_model().predict(blank, conf=self.conf, verbose=False)
+
+    def predict(self, source, **kwargs) -> list:
+        """
+        Run detection on an image, serializing access to the shared model.
+
+        Args:
+            source: Image or path accepted by YOLO.predict
+            **kwargs: Extra YOLO.predict options
+
+        Returns:
+            list: YOLO results, one per input image
+        """
+        with self._lock:
+            model = self._get_model()
+            with self.timings.measure():
+                results = model.predict(source, conf=self.conf, verbose=False, **kwargs)
+        return results
+
+    def detect(self, image: Image.Image) -> List[PlateDetection]:
+        """
+        Detect plates in an RGB image without writing anything to disk.
+
+        Args:
+            image (Image.Image): RGB image to search
+
+        Returns:
+            List[PlateDetection]: Detections ranked by confidence, highest first
+        """
+        return _to_detections(image, self.predict(image)[0])
+
+    def detect_batch(
+        self, images: Iterable[Image.Image], batch_size: int = DETECTION_BATCH_SIZE
+    ) -> List[List[PlateDetection]]:
+        """
+        Detect plates in many RGB images, several per inference call.
+
+        Images are consumed lazily so only one batch is held in memory. A model
+        exported with a fixed batch size takes exactly that many images per
+        call, so its batch size wins and the last batch is padded with blank
+        frames; a dynamic model runs short batches as they are.
+
+        Args:
+            images (Iterable[Image.Image]): RGB images to search
+            batch_size (int): Number of images per call to a dynamic model
+
+        Returns:
+            List[List[PlateDetection]]: Ranked detections per image, in input order
+        """
+        with self._lock:
+            self._get_model()
+            static_batch = self._static_batch
+        batch_size = static_batch or batch_size
+
+        detections = []
+        images = iter(images)
+        while True:
+            chunk = list(itertools.islice(images, batch_size))
+            if not chunk:
+                return detections
+
+            padding = batch_size - len(chunk) if static_batch else 0
+            blank = Image.new("RGB", (DETECTION_IMAGE_SIZE, DETECTION_IMAGE_SIZE))
+            results = self.predict(
+                chunk + [blank] * padding,
+                batch=len(chunk) + padding,
+                imgsz=DETECTION_IMAGE_SIZE,
+            )
+            detections.extend(map(_to_detections, chunk, results))
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        return self.timings.stats()
+
+    def summary(self) -> str:
+        return self.timings.summary("detector")
+
+
+_detector: Optional[LicencePlateDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_detector() -> LicencePlateDetector:
+    """Return the process-wide licence plate detector."""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = LicencePlateDetector()
+        return _detector
@@ -1,31 +1,42 @@
 import os
 from src.config import PROJECT_ROOT
 
+JPEG_EXTENSIONS = (".jpeg", ".jpg")
+SUPPORTED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".heic", ".heif")
 
-def _get_image_paths(subdir, prefix=None) -> list[str]:
-    """Get paths to images with specified criteria from given subdirectory."""
+
+def _get_image_paths(subdir, prefix=None, extensions=JPEG_EXTENSIONS) -> list[str]:
+    """Get sorted paths to images with specified criteria from given subdirectory."""
     try:
         input_dir = os.path.join(PROJECT_ROOT, f"data/{subdir}")
         return [
             os.path.join(input_dir, f)
-            for f in os.listdir(input_dir)
-            if f.lower().endswith((".jpeg", ".jpg"))
+            for f in sorted(os.listdir(input_dir))
+            if f.lower().endswith(extensions)
             and (prefix is None or f.lower().startswith(prefix))
         ]
     except Exception as e:
         raise ValueError(f"Error retrieving paths from {subdir}: {e}")
 
 
-def get_jpeg_paths() -> list[str]:
-    """Retrieve paths to all JPEG images in the original data directory."""
-    return _get_image_paths("original")
+def get_incident_names() -> list[str]:
+    """Retrieve the names of incident subdirectories in the original data directory."""
+    try:
+        input_dir = os.path.join(PROJECT_ROOT, "data/original")
+        return sorted(
+            f.name for f in os.scandir(input_dir) if f.is_dir() and f.name[0] != "."
+        )
+    except Exception as e:
+        raise ValueError(f"Error retrieving incidents from original: {e}")
 
 
-def get_timestamped_jpeg_paths() -> list[str]:
-    """Retrieve paths to all timestamped JPEG images in the processed data directory."""
-    return _get_image_paths("processed", prefix="timestamped")
+def get_source_paths(incident: str = "") -> list[str]:
+    """Retrieve paths to all supported source photos of an incident (or top level)."""
+    return _get_image_paths(
+        os.path.join("original", incident), extensions=SUPPORTED_EXTENSIONS
+    )
 
 
-def get_licence_jpeg_path() -> list[str]:
-    """Retrieve paths to all licence plate JPEG images in the processed data directory."""
-    return _get_image_paths("processed/detections/crops/LicensePlate")
+def get_timestamped_jpeg_paths(incident: str = "") -> list[str]:
+    """Retrieve paths to all timestamped JPEG images of an incident (or top level)."""
+    return _get_image_paths(os.path.join("processed", incident), prefix="timestamped")
@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+from src.config import METADATA_CACHE_FILE
+
+try:
+    from pillow_heif import register_heif_opener
+except ImportError:  # HEIC/HEIF sources are rejected by Image.open instead
+    register_heif_opener = None
+
+# Constants
+EXIF_HEADER = b"Exif\x00\x00"
+EXIF_DATETIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+ORIENTATION_TAG = 274
+EXIF_IFD_TAG = 0x8769
+GPS_IFD_TAG = 0x8825
+# DateTimeOriginal, DateTimeDigitized, DateTime in order of preference
+DATETIME_TAGS = (36867, 36868, 306)
+# GPSLatitudeRef, GPSLatitude, GPSLongitudeRef, GPSLongitude
+GPS_LATITUDE_TAGS = (1, 2)
+GPS_LONGITUDE_TAGS = (3, 4)
+JPEG_SOI = b"\xff\xd8"
+JPEG_APP1 = 0xE1
+JPEG_END_OF_HEADERS = (0xD9, 0xDA)
+
+if register_heif_opener is not None:
+    register_heif_opener()
+
+_cache: Optional[Dict[str, dict]] = None
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class ImageMetadata:
+    """Capture time, orientation and GPS position parsed from an image header."""
+
+    captured_at: Optional[str] = None
+    orientation: Optional[int] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+    @property
+    def has_gps(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+
+def _read_jpeg_exif(file_path: str) -> Optional[bytes]:
+    """Returns the raw APP1/EXIF segment of a JPEG, reading only its headers."""
+    with open(file_path, "rb") as f:
+        if f.read(2) != JPEG_SOI:
+            return None
+
+        while True:
+            marker = f.read(2)
+            if len(marker) < 2 or marker[0] != 0xFF:
+                return None
+            while marker[1] == 0xFF:  # Fill bytes before the marker code
+                byte = f.read(1)
+                if not byte:
+                    return None
+                marker = marker[1:] + byte
+            if marker[1] in JPEG_END_OF_HEADERS:
+                return None
+
+            # The length counts its own two bytes; less means a corrupt header,
+            # and a short read a truncated file (e.g. one still being copied)
+            header = f.read(2)
+            if len(header) < 2:
+                return None
+            length = int.from_bytes(header, "big")
+            if length < 2:
+                return None
+            if marker[1] == JPEG_APP1:
+                segment = f.read(length - 2)
+                if len(segment) < length - 2:
+                    return None
+                if segment.startswith(EXIF_HEADER):
+                    return segment
+            else:
+                f.seek(length - 2, os.SEEK_CUR)
+
+
+def _read_exif(file_path: str) -> Image.Exif:
+    """Parses EXIF tags without decoding any pixel data."""
+    segment = _read_jpeg_exif(file_path)
+    if segment is not None:
+        exif = Image.Exif()
+        exif.load(segment)
+        return exif
+
+    # Non-JPEG sources: Image.open only parses the container headers
+    with Image.open(file_path) as img:
+        return img.getexif()
+
+
+def _gps_coordinate(gps: dict, tags: tuple) -> Optional[float]:
+    """Converts a GPS degrees/minutes/seconds triple to signed decimal degrees."""
+    ref, coord = gps.get(tags[0]), gps.get(tags[1])
+    if not isinstance(coord, (list, tuple)) or len(coord) != 3:
+        return None
+    degrees, minutes, seconds = (float(value) for value in coord)
+    decimal = degrees + minutes / 60 + seconds / 3600
+    return -decimal if ref in ("S", "W") else decimal
+
+
+def _parse_metadata(file_path: str) -> ImageMetadata:
+    """Builds the metadata record for a file from its EXIF header."""
+    exif = _read_exif(file_path)
+    tags = {**exif, **exif.get_ifd(EXIF_IFD_TAG)}
+
+    captured_at = None
+    for tag in DATETIME_TAGS:
+        try:
+            captured_at = datetime.strptime(
+                str(tags[tag]).strip("\x00 "), EXIF_DATETIME_FORMAT
+            ).isoformat()
+            break
+        except (KeyError, ValueError):
+            pass
+
+    gps = exif.get_ifd(GPS_IFD_TAG)
+    return ImageMetadata(
+        captured_at=captured_at,
+        orientation=exif.get(ORIENTATION_TAG),
+        latitude=_gps_coordinate(gps, GPS_LATITUDE_TAGS),
+        longitude=_gps_coordinate(gps, GPS_LONGITUDE_TAGS),
+    )
+
+
+def _cache_key(file_path: str) -> str:
+    """Keys a file by path, size and modification time."""
+    stat = os.stat(file_path)
+    return f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+def _load_cache() -> Dict[str, dict]:
+    """Loads the on-disk metadata store once per process."""
+    global _cache
+    if _cache is None:
+        try:
+            with open(METADATA_CACHE_FILE, encoding="utf-8") as f:
+                _cache = json.load(f)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def _save_cache(cache: Dict[str, dict]) -> None:
+    """Writes the store atomically, dropping entries for files that are gone."""
+    cache = {k: v for k, v in cache.items() if os.path.exists(k.rsplit("|", 2)[0])}
+    os.makedirs(os.path.dirname(METADATA_CACHE_FILE), exist_ok=True)
+    temp_path = f"{METADATA_CACHE_FILE}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(temp_path, METADATA_CACHE_FILE)
+
+
+def get_metadata_batch(file_paths: List[str]) -> List[ImageMetadata]:
+    """
+    Read header metadata for several files, parsing each header at most once.
+
+    Args:
+        file_paths (List[str]): Paths of the images to inspect
+
+    Returns:
+        List[ImageMetadata]: One record per path, in the same order
+    """
+    with _cache_lock:
+        cache = _load_cache()
+        records, dirty = [], False
+        for file_path in file_paths:
+            try:
+                key = _cache_key(file_path)
+                if key not in cache:
+                    cache[key] = asdict(_parse_metadata(file_path))
+                    dirty = True
+                records.append(ImageMetadata(**cache[key]))
+            except Exception as e:
+                raise ValueError(f"get_metadata(): File={file_path}: {e}")
+
+        if dirty:
+            try:
+                _save_cache(cache)
+            except OSError:
+                pass  # The in-memory cache still serves this process
+        return records
+
+
+def get_metadata(file_path: str) -> ImageMetadata:
+    """Read header metadata for a single file through the shared cache."""
+    return get_metadata_batch([file_path])[0]
@@ -1,7 +1,9 @@
 import os
 from PIL import Image
 import shutil
+from typing import List
 
+from src.data_handling.artifacts import evict_artifacts
 
 
 def save_img(filename: str, image: Image.Image) -> str:
@@ -9,16 +11,15 @@ def save_img(filename: str, image: Image.Image) -> str:
     Save the processed image to the data/processed directory.
 
     Args:
-        filename (str): Name of the file to save
+        filename (str): Name of the file to save, optionally under a subdirectory
         image (Image.Image): PIL Image object to save
 
     Returns:
         str: Path to the saved file
     """
     try:
-        output_dir = "data/processed"
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, f"{filename}.jpeg")
+        output_path = os.path.join("data/processed", f"{filename}.jpeg")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         image.save(output_path)
 
         return output_path
@@ -26,9 +27,47 @@ def save_img(filename: str, image: Image.Image) -> str:
         raise ValueError(f"save_img() error: {e}")
 
 
+def copy_img(filename: str, source_path: str) -> str:
+    """
+    Copy an already encoded JPEG into the data/processed directory.
+
+    Args:
+        filename (str): Name of the file to save, optionally under a subdirectory
+        source_path (str): Path of the encoded JPEG to copy
+
+    Returns:
+        str: Path to the saved file
+    """
+    try:
+        output_path = os.path.join("data/processed", f"{filename}.jpeg")
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        shutil.copyfile(source_path, output_path)
+
+        return output_path
+    except Exception as e:
+        raise ValueError(f"copy_img() error: {e}")
+
+
+def clear_incident(incident: str, source_paths: List[str]) -> None:
+    """Clear the source photos and processed folder of a single incident."""
+    for source_path in source_paths:
+        try:
+            os.remove(source_path)
+        except OSError:
+            pass
+    shutil.rmtree(os.path.join("data/processed", incident), ignore_errors=True)
+
+    # Drop the incident's source folder once it is empty
+    try:
+        os.rmdir(os.path.join("data/original", incident))
+    except OSError:
+        pass
+
+
 def clear_IO() -> None:
-    """Clear the folders."""
+    """Clear the working folders and evict stale cached artifacts."""
     directories = ["data/processed", "data/original"]
     for directory in directories:
         shutil.rmtree(directory, ignore_errors=True)
         os.makedirs(directory, exist_ok=True)
+    evict_artifacts()
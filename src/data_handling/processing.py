@@ -1,100 +1,185 @@
 import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from io import BytesIO
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Union
-
-import requests
-from PIL import Image, ImageDraw, ImageFont, ExifTags
-from paddleocr import PaddleOCR
-from ultralytics import YOLO
-
-from src.config import INPUT_DIR, PROCESSED_DIR, FONT_FILE
-from src.data_handling.input import get_jpeg_paths, get_licence_jpeg_path
-from src.data_handling.output import save_img
+from functools import lru_cache
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from src.config import (
+    CAPTCHA_MIN_CONFIDENCE,
+    FONT_FILE,
+    PREPROCESS_MEMORY_BUDGET,
+    PREPROCESS_WORKERS,
+    SAVE_DETECTION_CROPS,
+)
+from src.data_handling.artifacts import (
+    artifact_key,
+    file_digest,
+    get_artifact,
+    get_json_artifact,
+    put_artifact,
+    put_json_artifact,
+)
+from src.data_handling.captcha import get_captcha_recognizer
+from src.data_handling.detection import (
+    DETECTION_CONFIDENCE,
+    DETECTION_IMAGE_SIZE,
+    LICENCE_MODEL,
+    PlateDetection,
+    crop_box,
+    get_detector,
+    scale_box,
+)
+from src.data_handling.input import get_source_paths
+from src.data_handling.metadata import ImageMetadata, get_metadata, get_metadata_batch
+from src.data_handling.recognition import OCR_LANG, get_ocr_engine
+from src.data_handling.output import copy_img, save_img
 from src.utils.ui import status_print, StatusLevel
 
 # Constants
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
 FONT_SIZE = 120
 TEXT_MARGIN = 120
-SUPPORTED_EXTENSIONS = (".png", ".jpg", ".heic", ".heif")
+OUTLINE_WIDTH = 5
+OUTLINE_OFFSETS = [(-1, -1), (-1, 1), (1, -1), (1, 1), (0, -1), (0, 1), (-1, 0), (1, 0)]
+STAMP_CACHE_SIZE = 32
+RESIZE_FACTOR = 0.3
 JPEG_EXTENSION = ".jpeg"
-JPEG_QUALITY = 95
-ORIENTATION_TAG = 274
+MAX_PLATE_CANDIDATES = 5
+PLATE_CROP_MARGIN = 0.1
+ROTATIONS = {
+    3: Image.Transpose.ROTATE_180,
+    6: Image.Transpose.ROTATE_270,
+    8: Image.Transpose.ROTATE_90,
+}
 
 
-def _convert_to_jpeg() -> None:
-    """Converts images to JPEG format, preserving EXIF data and applying rotation."""
-    for filename in os.listdir(INPUT_DIR):
-        if not filename.lower().endswith(SUPPORTED_EXTENSIONS):
-            continue
+@dataclass
+class ImageRecord:
+    """A source photo decoded once, upright and at upload size."""
 
-        file_path = os.path.join(INPUT_DIR, filename)
-        try:
-            with Image.open(file_path) as img:
-                # Apply EXIF rotation if needed
-                if hasattr(img, "_getexif") and img._getexif():
-                    exif = img._getexif()
-                    if exif and ORIENTATION_TAG in exif:
-                        rotation = {3: 180, 6: 270, 8: 90}.get(exif[ORIENTATION_TAG])
-                        if rotation:
-                            img = img.rotate(rotation, expand=True)
-
-                # Convert to RGB if needed and resize
-                img = img.convert("RGB") if img.mode != "RGB" else img
-                img = img.resize((int(img.width * 0.3), int(img.height * 0.3)))
-
-                # Save as JPEG with EXIF
-                output_path = os.path.join(
-                    INPUT_DIR, f"{os.path.splitext(filename)[0]}{JPEG_EXTENSION}"
-                )
-                img.save(
-                    output_path, "JPEG", quality=JPEG_QUALITY, exif=img.info.get("exif")
-                )
+    source_path: str
+    image: Image.Image
 
-                # Remove original if different from output
-                if file_path != output_path:
-                    os.remove(file_path)
-        except Exception as e:
-            raise ValueError(f"_convert_to_jpeg(): File={filename}: {e}")
 
+def _format_datetime(file_path: str, metadata: ImageMetadata) -> str:
+    """Formats the EXIF capture time, falling back to file metadata."""
+    if metadata.captured_at:
+        return datetime.fromisoformat(metadata.captured_at).strftime(TIMESTAMP_FORMAT)
 
-def _add_timestamp(image: Image.Image, text: str) -> Image.Image:
-    """Adds timestamp text to the image with a background."""
+    file_time = (
+        os.path.getctime(file_path) if os.name == "nt" else os.path.getmtime(file_path)
+    )
+    return datetime.fromtimestamp(file_time).strftime(TIMESTAMP_FORMAT)
+
+
+def _load_image(file_path: str, metadata: ImageMetadata) -> ImageRecord:
+    """
+    Decodes a source photo once, applying EXIF rotation and the upload resize.
+
+    JPEG sources are decoded at the smallest DCT scale that still covers the
+    target size, so only the final fine resize runs on the reduced image. The
+    metadata is the caller's, already parsed to key the cached output.
+    """
     try:
-        image_copy = image.copy()
-        original_exif = image.info.get("exif")
+        with Image.open(file_path) as img:
+            rotation = ROTATIONS.get(metadata.orientation)
+            width = int(img.width * RESIZE_FACTOR)
+            height = int(img.height * RESIZE_FACTOR)
+            img.draft("RGB", (width, height))
+
+            image = img.transpose(rotation) if rotation is not None else img
+            image = image.convert("RGB") if image.mode != "RGB" else image
+            if rotation in (Image.Transpose.ROTATE_90, Image.Transpose.ROTATE_270):
+                width, height = height, width
+            image = image.resize((width, height))
+
+        return ImageRecord(file_path, image)
+    except Exception as e:
+        raise ValueError(f"_load_image(): File={file_path}: {e}")
 
-        # Get font (fallback to default if needed)
-        try:
-            font = ImageFont.truetype(FONT_FILE, FONT_SIZE)
-        except (IOError, OSError):
-            font = ImageFont.load_default()
-            if hasattr(font, "size"):
-                font = font.font_variant(size=FONT_SIZE)
-
-        # Draw text with outline
-        draw = ImageDraw.Draw(image_copy)
-        text_width, text_height = draw.textbbox((0, 0), text, font=font)[2:4]
-        text_x = image_copy.width - text_width - TEXT_MARGIN
-        text_y = image_copy.height - text_height - TEXT_MARGIN
-
-        # Add black outline then white text
-        for dx, dy in [
-            (-1, -1),
-            (-1, 1),
-            (1, -1),
-            (1, 1),
-            (0, -1),
-            (0, 1),
-            (-1, 0),
-            (1, 0),
-        ]:
-            draw.text((text_x + dx * 5, text_y + dy * 5), text, font=font, fill="black")
-        draw.text((text_x, text_y), text, font=font, fill="white")
-
-        image_copy.info["exif"] = original_exif
-        return image_copy
+
+def load_detection_input(file_path: str) -> Image.Image:
+    """
+    Decodes a source photo just large enough for the plate detector.
+
+    JPEG sources are decoded at a reduced DCT scale, then the upright image is
+    fitted within the detector's input size.
+    """
+    try:
+        with Image.open(file_path) as img:
+            rotation = ROTATIONS.get(get_metadata(file_path).orientation)
+            img.draft("RGB", (DETECTION_IMAGE_SIZE, DETECTION_IMAGE_SIZE))
+            image = img.transpose(rotation) if rotation is not None else img
+            image = image.convert("RGB") if image.mode != "RGB" else image
+            return ImageOps.contain(image, (DETECTION_IMAGE_SIZE, DETECTION_IMAGE_SIZE))
+    except Exception as e:
+        raise ValueError(f"load_detection_input(): File={file_path}: {e}")
+
+
+def _load_full_image(file_path: str) -> np.ndarray:
+    """Decodes a source photo upright at its native resolution."""
+    try:
+        with Image.open(file_path) as img:
+            rotation = ROTATIONS.get(get_metadata(file_path).orientation)
+            image = img.transpose(rotation) if rotation is not None else img
+            return np.asarray(image.convert("RGB"))
+    except Exception as e:
+        raise ValueError(f"_load_full_image(): File={file_path}: {e}")
+
+
+@lru_cache(maxsize=None)
+def _get_font(size: int) -> ImageFont.ImageFont:
+    """Loads the timestamp font once per size (fallback to default if needed)."""
+    try:
+        return ImageFont.truetype(FONT_FILE, size)
+    except (IOError, OSError):
+        font = ImageFont.load_default()
+        if hasattr(font, "size"):
+            font = font.font_variant(size=size)
+        return font
+
+
+@lru_cache(maxsize=STAMP_CACHE_SIZE)
+def _render_stamp(text: str, font_size: int, outline: int) -> Image.Image:
+    """Pre-renders outlined timestamp text as a transparent RGBA tile."""
+    font = _get_font(font_size)
+    text_width, text_height = font.getbbox(text)[2:4]
+    tile = Image.new(
+        "RGBA", (text_width + 2 * outline, text_height + 2 * outline), (0, 0, 0, 0)
+    )
+
+    # Add black outline then white text
+    draw = ImageDraw.Draw(tile)
+    for dx, dy in OUTLINE_OFFSETS:
+        draw.text(
+            (outline + dx * outline, outline + dy * outline),
+            text,
+            font=font,
+            fill="black",
+        )
+    draw.text((outline, outline), text, font=font, fill="white")
+    return tile
+
+
+def _add_timestamp(image: Image.Image, text: str) -> Image.Image:
+    """Composites the cached timestamp tile into the bottom-right corner in place."""
+    try:
+        stamp = _render_stamp(text, FONT_SIZE, OUTLINE_WIDTH)
+        image.paste(
+            stamp,
+            (
+                image.width - stamp.width - TEXT_MARGIN + OUTLINE_WIDTH,
+                image.height - stamp.height - TEXT_MARGIN + OUTLINE_WIDTH,
+            ),
+            stamp,
+        )
+        return image
     except Exception as e:
         raise ValueError(f"_add_timestamp(): {e}")
 
@@ -102,118 +187,441 @@ def _add_timestamp(image: Image.Image, text: str) -> Image.Image:
 def get_datetime(file_path: str) -> str:
     """Extracts timestamp from image EXIF data or file metadata."""
     try:
-        with Image.open(file_path) as img:
-            # Try to extract datetime from EXIF
-            exif = img._getexif() or {}
-            for tag, value in exif.items():
-                if ExifTags.TAGS.get(tag) in (
-                    "DateTimeOriginal",
-                    "CreateDate",
-                    "DateTimeDigitized",
-                    "DateTime",
-                ):
-                    try:
-                        return datetime.strptime(
-                            str(value), "%Y:%m:%d %H:%M:%S"
-                        ).strftime(TIMESTAMP_FORMAT)
-                    except ValueError:
-                        pass
-
-            # Fallback to file metadata
-            file_time = (
-                os.path.getctime(file_path)
-                if os.name == "nt"
-                else os.path.getmtime(file_path)
-            )
-            return datetime.fromtimestamp(file_time).strftime(TIMESTAMP_FORMAT)
+        return _format_datetime(file_path, get_metadata(file_path))
     except Exception as e:
         raise ValueError(f"get_datetime(): File={file_path}: {e}")
 
 
-def licence_recognition() -> Union[List[str], None]:
-    """Detect and recognize licence plate from image."""
-    try:
-        # Clean previous results
-        img_path = get_jpeg_paths()[0]
-        model = YOLO("assets/models/yolo12m_licence.onnx", task="detect", verbose=False)
-        model.predict(
-            img_path,
-            project=PROCESSED_DIR,
-            name="detections",
-            conf=0.4,
-            save_crop=True,
-            exist_ok=True,
+def warm_up_models() -> None:
+    """Load the plate detector and OCR models up front and report their load times."""
+    models = [get_detector(), get_ocr_engine()]
+    if get_captcha_recognizer().available():
+        models.append(get_captcha_recognizer())
+    for model in models:
+        try:
+            model.warm_up()
+            status_print(model.summary(), StatusLevel.INFO)
+        except Exception as e:
+            status_print(f"Model warm-up failed: {e}", StatusLevel.WARNING)
+
+
+def _save_crops(incident: str, crops: List[np.ndarray]) -> None:
+    """Writes plate crops to data/processed/detections for debugging."""
+    for i, crop in enumerate(crops):
+        save_img(
+            os.path.join("detections", incident, f"crop_{i}"), Image.fromarray(crop)
         )
 
-        # Licence recognition
-        crop_path = get_licence_jpeg_path()[0]
-        print(crop_path)
-
-        # Use the ocr function directly with the file path as a local source
-        text = ocr(crop_path)
-        if not text:
-            return None
-
-        # Extract and filter text - only keep digits and uppercase letters
-        text = "".join(char for char in text if char.isdigit() or char.isupper())
-
-        # Check format patterns
-        if len(text) == 7 and text[:3].isalpha() and text[3:].isdigit():
-            return [text[:3], text[3:]]
-        if len(text) == 6 and (text[:4].isdigit() or text[2:].isdigit()):
-            return [
-                text[: 4 if text[:4].isdigit() else 2],
-                text[4 if text[:4].isdigit() else 2 :],
-            ]
+
+def _parse_licence(text: Optional[str]) -> Union[List[str], None]:
+    """Split recognized text into the two licence parts if it matches a plate format."""
+    if not text:
         return None
+
+    # Extract and filter text - only keep digits and uppercase letters
+    text = "".join(char for char in text if char.isdigit() or char.isupper())
+
+    # Check format patterns
+    if len(text) == 7 and text[:3].isalpha() and text[3:].isdigit():
+        return [text[:3], text[3:]]
+    if len(text) == 6 and (text[:4].isdigit() or text[2:].isdigit()):
+        return [
+            text[: 4 if text[:4].isdigit() else 2],
+            text[4 if text[:4].isdigit() else 2 :],
+        ]
+    return None
+
+
+def _reading_key(source_paths: List[str]) -> str:
+    """Keys the licence reading of an incident by the contents of all its photos."""
+    return artifact_key(
+        "+".join(file_digest(path) for path in source_paths),
+        "licence_reading",
+        {
+            "model": LICENCE_MODEL,
+            "conf": DETECTION_CONFIDENCE,
+            "detect_size": DETECTION_IMAGE_SIZE,
+            "crop_margin": PLATE_CROP_MARGIN,
+            "lang": OCR_LANG,
+            "candidates": MAX_PLATE_CANDIDATES,
+            "ocr": "recognition",
+        },
+    )
+
+
+def _native_crops(candidates: List[Tuple[str, PlateDetection]]) -> List[np.ndarray]:
+    """Crops plate candidates from their full-resolution photos, decoding each once."""
+    crops: List[Optional[np.ndarray]] = [None] * len(candidates)
+    for path in dict.fromkeys(path for path, _ in candidates):
+        pixels = _load_full_image(path)
+        size = (pixels.shape[1], pixels.shape[0])
+        for i, (candidate_path, detection) in enumerate(candidates):
+            if candidate_path == path:
+                box = scale_box(
+                    detection.box, detection.image_size, size, PLATE_CROP_MARGIN
+                )
+                crops[i] = crop_box(pixels, box)
+    return crops
+
+
+def _read_licence(
+    source_paths: List[str], detections: List[List[PlateDetection]]
+) -> Tuple[Optional[str], List[np.ndarray]]:
+    """
+    Read plate candidates, most confident first, until one parses.
+
+    Boxes found on the small detection input are mapped back to the source
+    photos and cropped at native resolution, so OCR gets every pixel of the
+    plate.
+
+    Args:
+        source_paths (List[str]): Photos of the incident
+        detections (List[List[PlateDetection]]): Detections per photo
+
+    Returns:
+        Tuple[Optional[str], List[np.ndarray]]: Recognized text, and the crops read
+    """
+    ranked = sorted(
+        (
+            (path, detection)
+            for path, image_detections in zip(source_paths, detections)
+            for detection in image_detections
+        ),
+        key=lambda candidate: candidate[1].confidence,
+        reverse=True,
+    )[:MAX_PLATE_CANDIDATES]
+    if not ranked:
+        return None, []
+    crops = _native_crops(ranked)
+
+    # Crops are single text lines, so read them together without text detection
+    for text, _ in get_ocr_engine().recognize(crops):
+        if _parse_licence(text):
+            return text, crops
+
+    # Fall back to the full pipeline in case the best crop holds more than the plate
+    text = ocr(crops[0])
+    return (text if _parse_licence(text) else None), crops
+
+
+def recognize_licences(
+    incidents: Dict[str, List[str]], save_crops: bool = SAVE_DETECTION_CROPS
+) -> Dict[str, Union[List[str], None]]:
+    """
+    Detect and recognize the licence plate of several incidents.
+
+    The photos of every incident without a cached reading go through the
+    detector in fixed-size batches at a small input size, then each
+    incident's candidates are cropped from the full-resolution photos and
+    read in order of confidence.
+
+    Args:
+        incidents (Dict[str, List[str]]): Source photos per incident name
+        save_crops (bool): Also write the plate crops to disk for debugging
+
+    Returns:
+        Dict[str, Union[List[str], None]]: The two licence parts per incident
+    """
+    keys = {incident: _reading_key(paths) for incident, paths in incidents.items()}
+    pending = {
+        incident: paths
+        for incident, paths in incidents.items()
+        if get_json_artifact(keys[incident]) is None
+    }
+
+    # Boxes and crops stay in memory from detection to recognition
+    detections = get_detector().detect_batch(
+        load_detection_input(path) for paths in pending.values() for path in paths
+    )
+    offset = 0
+    for incident, paths in pending.items():
+        text, crops = _read_licence(paths, detections[offset : offset + len(paths)])
+        offset += len(paths)
+        if save_crops:
+            _save_crops(incident, crops)
+        put_json_artifact(keys[incident], {"text": text})
+
+    return {
+        incident: _parse_licence(get_json_artifact(key)["text"])
+        for incident, key in keys.items()
+    }
+
+
+def licence_recognition(
+    source_paths: Optional[List[str]] = None, save_crops: bool = SAVE_DETECTION_CROPS
+) -> Union[List[str], None]:
+    """Detect and recognize the licence plate of one incident (default: all sources)."""
+    try:
+        source_paths = source_paths or get_source_paths()
+        return recognize_licences({"": source_paths}, save_crops)[""]
     except Exception as e:
+        status_print(
+            f"Licence recognition failed, plate will be asked for: {e}",
+            StatusLevel.WARNING,
+        )
         return None
 
 
-def ocr(url_or_path: str) -> str:
-    """Extract text from captcha image URL or local file path."""
+def load_rgb_array(source: Union[str, bytes, np.ndarray]) -> np.ndarray:
+    """Loads an OCR source (path, encoded bytes or array) as an RGB array."""
+    if isinstance(source, np.ndarray):
+        return source
+    if isinstance(source, bytes):
+        with Image.open(BytesIO(source)) as img:
+            return np.asarray(img.convert("RGB"))
+    with Image.open(source) as img:
+        return np.asarray(img.convert("RGB"))
+
+
+def ocr(source: Union[str, np.ndarray], text_line: bool = False) -> str:
+    """
+    Extract text from a local file path or an in-memory RGB array.
+
+    Sources known to hold a single line of text, such as captchas, can set
+    text_line to skip text detection and run only the recognition model.
+    """
     try:
-        if url_or_path.startswith("http"):
-            response = requests.get(url_or_path, timeout=10)
-            img = Image.open(BytesIO(response.content)).convert("RGB")
-            temp_path = save_img("captcha", img)
-            image_path = temp_path
+        if text_line:
+            readings = get_ocr_engine().recognize([load_rgb_array(source)])
         else:
-            # Directly use the local file path
-            image_path = url_or_path
+            if isinstance(source, np.ndarray):
+                # PaddleOCR expects arrays in OpenCV's BGR channel order
+                image = np.ascontiguousarray(source[..., ::-1])
+            else:
+                # Directly use the local file path
+                image = source
+            readings = [
+                detection[1]
+                for line in get_ocr_engine().ocr(image)
+                for detection in line or []
+            ]
 
         best_text = None
         max_conf = 0
 
-        for line in PaddleOCR(lang="en").ocr(image_path):
-            for detection in line:
-                text, conf = detection[1]
-                filtered_text = "".join(c for c in text if c.isdigit() or c.isupper())
-                if (len(filtered_text) >= 4) and conf > max_conf:
-                    max_conf = conf
-                    best_text = filtered_text
+        for text, conf in readings:
+            filtered_text = "".join(c for c in text if c.isdigit() or c.isupper())
+            if (len(filtered_text) >= 4) and conf > max_conf:
+                max_conf = conf
+                best_text = filtered_text
 
         return best_text
     except Exception as e:
-        raise ValueError(f"ocr(): Source={url_or_path}: {e}")
+        label = "array" if isinstance(source, np.ndarray) else source
+        raise ValueError(f"ocr(): Source={label}: {e}")
 
 
-def preprocess_img() -> None:
-    """Adds timestamps to JPEG images in the input directory."""
-    status_print("Processing images...", StatusLevel.INFO)
+def solve_captcha(image: np.ndarray) -> Optional[str]:
+    """
+    Read the report form captcha, falling back to general OCR when unsure.
 
-    # Convert to JPEG format
-    _convert_to_jpeg()
+    Args:
+        image (np.ndarray): RGB captcha image
 
-    # Add timestamp to each image
-    jpeg_paths = get_jpeg_paths()
-    for i, img_path in enumerate(jpeg_paths):
+    Returns:
+        Optional[str]: Captcha text, or None if it could not be read
+    """
+    recognizer = get_captcha_recognizer()
+    if recognizer.available():
         try:
-            with Image.open(img_path) as img:
-                time_stamp = get_datetime(img_path)
-                save_img(f"timestamped_{i}", _add_timestamp(img, time_stamp))
+            text, confidence = recognizer.predict(image)
+            if text and confidence >= CAPTCHA_MIN_CONFIDENCE:
+                return text
+            status_print(
+                f"Captcha read as {text or '-'} ({confidence:.2f}), falling back to OCR",
+                StatusLevel.WARNING,
+            )
         except Exception as e:
-            status_print(f"Error processing image {img_path}: {e}", StatusLevel.ERROR)
-            raise ValueError(f"preprocess_img(): Image Path={img_path}: {e}")
+            status_print(f"Captcha recognizer failed: {e}", StatusLevel.WARNING)
+    return ocr(image, text_line=True)
+
+
+def _timestamped_key(img_path: str, metadata: ImageMetadata) -> Tuple[str, str]:
+    """The timestamp stamped on a photo, and the artifact key of the result."""
+    timestamp = _format_datetime(img_path, metadata)
+    key = artifact_key(
+        file_digest(img_path),
+        "timestamped",
+        {
+            "timestamp": timestamp,
+            "resize": RESIZE_FACTOR,
+            "font_size": FONT_SIZE,
+            "margin": TEXT_MARGIN,
+            "outline": OUTLINE_WIDTH,
+        },
+    )
+    return timestamp, key
+
+
+def process_image(index: int, img_path: str, incident: str = "") -> str:
+    """Stamps a single source photo and returns the path of its timestamped JPEG."""
+    try:
+        output_name = os.path.join(incident, f"timestamped_{index}")
+        metadata = get_metadata(img_path)
+        timestamp, key = _timestamped_key(img_path, metadata)
+
+        # Reuse the stamped output of an earlier run on the same photo
+        cached_path = get_artifact(key, JPEG_EXTENSION)
+        if cached_path is not None:
+            return copy_img(output_name, cached_path)
+
+        record = _load_image(img_path, metadata)
+        output_path = save_img(output_name, _add_timestamp(record.image, timestamp))
+        put_artifact(key, JPEG_EXTENSION, output_path)
+        return output_path
+    except Exception as e:
+        raise ValueError(f"preprocess_img(): Image Path={img_path}: {e}")
+
+
+class MemoryBudget:
+    """Caps the estimated bytes of photos in flight and records the high-water mark."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.high_water = 0
+
+    def try_acquire(self, size: int) -> bool:
+        """Reserves memory for a photo; one photo is always admitted on its own."""
+        if self.used and self.used + size > self.limit:
+            return False
+        self.used += size
+        self.high_water = max(self.high_water, self.used)
+        return True
+
+    def release(self, size: int) -> None:
+        self.used -= size
 
-    status_print(f"Processed {len(jpeg_paths)} images", StatusLevel.SUCCESS)
+
+def _estimate_memory(img_path: str) -> int:
+    """
+    Estimates the peak pixel memory of processing a photo from its header.
+
+    A photo stamped by an earlier run is copied from the artifact cache
+    without being decoded, so it needs none.
+    """
+    try:
+        _, key = _timestamped_key(img_path, get_metadata(img_path))
+        if get_artifact(key, JPEG_EXTENSION) is not None:
+            return 0
+        with Image.open(img_path) as img:
+            width, height = img.size
+            reduction = 1
+            if img.format == "JPEG":
+                # Mirror the DCT scale draft() picks in _load_image
+                while reduction < 8 and RESIZE_FACTOR * reduction * 2 <= 1:
+                    reduction *= 2
+    except Exception as e:
+        raise ValueError(f"preprocess_img(): Image Path={img_path}: {e}")
+
+    decoded = (width // reduction) * (height // reduction)
+    resized = int(width * RESIZE_FACTOR) * int(height * RESIZE_FACTOR)
+    return (decoded + resized) * 3
+
+
+def iter_preprocess(
+    jobs: Iterable[Tuple[int, str, str]], budget: MemoryBudget, workers: int = 1
+) -> Iterator[str]:
+    """
+    Streams timestamped JPEG paths for (index, source path, incident) jobs in order.
+
+    Jobs are only started while their estimated decode, stamp and encode memory
+    fits within the budget; otherwise the oldest job is finished first.
+
+    Args:
+        jobs (Iterable[Tuple[int, str, str]]): Arguments for process_image
+        budget (MemoryBudget): Memory budget shared by the jobs in flight
+        workers (int): Number of worker processes; 1 processes photos in-line
+
+    Yields:
+        str: Path of each timestamped image, in job order
+    """
+    if workers <= 1:
+        for job in jobs:
+            size = _estimate_memory(job[1])
+            budget.try_acquire(size)
+            output_path = process_image(*job)
+            budget.release(size)
+            yield output_path
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Tuple[Future, int]] = deque()
+        for job in jobs:
+            size = _estimate_memory(job[1])
+            while not budget.try_acquire(size):
+                future, held = pending.popleft()
+                output_path = future.result()
+                budget.release(held)
+                yield output_path
+            pending.append((executor.submit(process_image, *job), size))
+
+        while pending:
+            future, held = pending.popleft()
+            output_path = future.result()
+            budget.release(held)
+            yield output_path
+
+
+def preprocess_incidents(
+    incidents: Dict[str, List[str]],
+    workers: int = PREPROCESS_WORKERS,
+    memory_budget: int = PREPROCESS_MEMORY_BUDGET,
+) -> Dict[str, List[str]]:
+    """
+    Decodes each source photo of several incidents once and writes its
+    timestamped JPEG, streaming all of them through one worker pool.
+
+    Args:
+        incidents (Dict[str, List[str]]): Source photos per incident name, which is
+            also the output subdirectory ("" is top level)
+        workers (int): Number of worker processes; 1 processes photos in-line
+        memory_budget (int): Bytes of pixel data allowed in flight at once
+
+    Returns:
+        Dict[str, List[str]]: Timestamped image paths per incident, in source order
+    """
+    status_print("Processing images...", StatusLevel.INFO)
+
+    source_paths = [path for paths in incidents.values() for path in paths]
+    jobs = (
+        (i, source_path, incident)
+        for incident, incident_paths in incidents.items()
+        for i, source_path in enumerate(incident_paths)
+    )
+    budget = MemoryBudget(memory_budget)
+    outputs: Dict[str, List[str]] = {incident: [] for incident in incidents}
+    try:
+        # Parse headers once up front so workers only hit the metadata cache
+        get_metadata_batch(source_paths)
+        workers = min(workers, len(source_paths))
+        job_incidents = (
+            incident for incident, paths in incidents.items() for _ in paths
+        )
+        for incident, output_path in zip(
+            job_incidents, iter_preprocess(jobs, budget, workers)
+        ):
+            outputs[incident].append(output_path)
+    except ValueError as e:
+        status_print(f"Error processing images: {e}", StatusLevel.ERROR)
+        raise
+
+    status_print(
+        f"Processed {len(source_paths)} images "
+        f"(peak {budget.high_water / 2**20:.0f} MB reserved, estimated)",
+        StatusLevel.SUCCESS,
+    )
+    return outputs
+
+
+def preprocess_img(workers: int = PREPROCESS_WORKERS) -> List[str]:
+    """
+    Decodes each source photo once and writes its timestamped JPEG.
+
+    Args:
+        workers (int): Number of worker processes; 1 processes photos in-line
+
+    Returns:
+        List[str]: Paths of the timestamped images, in source order
+    """
+    return preprocess_incidents({"": get_source_paths()}, workers)[""]
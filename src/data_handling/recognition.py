@@ -0,0 +1,145 @@
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.utils.latency import LatencyStats
+
+if TYPE_CHECKING:
+    from paddleocr import PaddleOCR
+
+# Constants
+OCR_LANG = "en"
+WARM_UP_SHAPE = (48, 160, 3)
+REC_IMAGE_HEIGHT = 48
+REC_MAX_WIDTH = 320
+GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def _normalize_line(image: np.ndarray) -> np.ndarray:
+    """Grayscale, contrast-stretched and scaled to the recognizer's input height."""
+    if image.size == 0:
+        return np.full((REC_IMAGE_HEIGHT, 1), 255, dtype=np.uint8)
+
+    gray = image.astype(np.float32)
+    if gray.ndim == 3:
+        gray = gray[..., :3] @ GRAY_WEIGHTS
+    low, high = gray.min(), gray.max()
+    gray = (gray - low) * (255.0 / max(high - low, 1.0))
+
+    height, width = gray.shape
+    width = min(REC_MAX_WIDTH, max(1, round(width * REC_IMAGE_HEIGHT / height)))
+    line = Image.fromarray(gray.astype(np.uint8)).resize(
+        (width, REC_IMAGE_HEIGHT), Image.Resampling.BILINEAR
+    )
+    return np.asarray(line)
+
+
+def prepare_text_lines(images: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Stack single-line text crops into one batch for the text recognizer.
+
+    Each crop is normalized on its own and then padded on the right with its
+    background level, so every line in the batch shares the same width.
+
+    Args:
+        images (Sequence[np.ndarray]): RGB crops holding one line of text each
+
+    Returns:
+        np.ndarray: uint8 batch of shape (N, REC_IMAGE_HEIGHT, width, 3)
+    """
+    lines = [_normalize_line(image) for image in images]
+    width = max(line.shape[1] for line in lines)
+    batch = np.empty((len(lines), REC_IMAGE_HEIGHT, width), dtype=np.uint8)
+    for i, line in enumerate(lines):
+        edges = np.concatenate((line[:, 0], line[:, -1]))
+        batch[i] = np.median(edges)
+        batch[i, :, : line.shape[1]] = line
+    return np.repeat(batch[..., np.newaxis], 3, axis=3)
+
+
+class OcrEngine:
+    """PaddleOCR engine that loads its models once and is shared by all callers."""
+
+    def __init__(self, lang: str = OCR_LANG):
+        self.lang = lang
+        self.timings = LatencyStats()
+        self._engine: Optional["PaddleOCR"] = None
+        self._lock = threading.Lock()
+
+    def _get_engine(self) -> "PaddleOCR":
+        """Imports and loads the OCR models on first use; callers must hold the lock."""
+        if self._engine is None:
+            with self.timings.measure_load():
+                from paddleocr import PaddleOCR
+
+                self._engine = PaddleOCR(lang=self.lang)
+        return self._engine
+
+    def warm_up(self) -> None:
+        """Loads the models and runs one blank inference to initialize them."""
+        blank = np.full(WARM_UP_SHAPE, 255, dtype=np.uint8)
+        with self._lock:
+            engine = self._get_engine()
+            engine.ocr(blank)
+            engine.ocr([blank], det=False, cls=False)
+
+    def ocr(self, source) -> list:
+        """
+        Run text detection and recognition, serializing access to the shared engine.
+
+        Args:
+            source: Image path or array accepted by PaddleOCR.ocr
+
+        Returns:
+            list: PaddleOCR lines of (box, (text, confidence)) detections
+        """
+        with self._lock:
+            engine = self._get_engine()
+            with self.timings.measure():
+                result = engine.ocr(source)
+        return result
+
+    def recognize(self, images: Sequence[np.ndarray]) -> List[Tuple[str, float]]:
+        """
+        Read single lines of text, such as plate crops or captchas, in one batch.
+
+        Text detection is skipped and only the recognition model runs.
+
+        Args:
+            images (Sequence[np.ndarray]): RGB crops holding one line of text each
+
+        Returns:
+            List[Tuple[str, float]]: Text and confidence per crop, in input order
+        """
+        if not images:
+            return []
+
+        batch = prepare_text_lines(images)
+        with self._lock:
+            engine = self._get_engine()
+            with self.timings.measure():
+                # A list of crops without detection is recognized as one batch,
+                # returned as a single page of (text, confidence) lines
+                results = engine.ocr(list(batch), det=False, cls=False)[0]
+        return [(text, float(conf)) for text, conf in results]
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        return self.timings.stats()
+
+    def summary(self) -> str:
+        return self.timings.summary("OCR engine")
+
+
+_engine: Optional[OcrEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_ocr_engine() -> OcrEngine:
+    """Return the process-wide OCR engine shared by plate and captcha recognition."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = OcrEngine()
+        return _engine
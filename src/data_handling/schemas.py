@@ -1,8 +1,8 @@
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
 
 # from src.utils.location import get_address
-from src.data_handling.input import get_jpeg_paths
+from src.data_handling.input import get_source_paths
 from src.utils.ui import clean_input
 from src.data_handling.processing import get_datetime, licence_recognition
 from src.config import POLICE_DICT
@@ -29,6 +29,7 @@ class ReportData:
     complaint_description: str
     category_parent: str
     category_child: str
+    image_paths: List[str] = field(default_factory=list)
 
 
 # Constants
@@ -71,14 +72,16 @@ report_data = ReportData(
 )
 
 
-def _prep_licence() -> None:
+def _prep_licence(
+    report_data: ReportData, source_paths: List[str], recognize: bool = True
+) -> None:
     """
     Prepare license plate data for the report.
-    Tries OCR detection first, then falls back to manual input.
+    Tries OCR detection first when recognize is set, then falls back to manual input.
     """
     # Try automatic OCR detection
     try:
-        ocr_result = licence_recognition()
+        ocr_result = licence_recognition(source_paths) if recognize else None
         if ocr_result:
             licence_first, licence_second = ocr_result
             if clean_input(
@@ -115,7 +118,7 @@ def _prep_licence() -> None:
             print("License parts must be at least 2 alphanumeric characters.")
 
 
-def _prep_confirm() -> bool:
+def _prep_confirm(report_data: ReportData) -> bool:
     """
     Display a summary of all collected data and ask for confirmation.
 
@@ -138,25 +141,41 @@ def _prep_confirm() -> bool:
     return confirm in ("y", "")
 
 
-def prepare_data() -> Tuple[PersonalInfo, ReportData]:
+def prepare_data(
+    source_paths: Optional[List[str]] = None,
+    image_paths: Optional[List[str]] = None,
+    recognize: bool = True,
+) -> Tuple[PersonalInfo, ReportData]:
     """
     Prepare report data by gathering information from image and user input.
+
+    Args:
+        source_paths (List[str]): Source photos of the incident (defaults to data/original)
+        image_paths (List[str]): Timestamped images to upload with the report
+        recognize (bool): Detect the licence plate, otherwise ask for it
+
+    Returns:
+        Tuple[PersonalInfo, ReportData]: Personal info and a report of this incident
     """
     status_print("Collecting incident information...", StatusLevel.INFO)
     try:
-        img_path = get_jpeg_paths()[0]
-        report_data.incident_datetime = get_datetime(img_path)
-
-        # report_data.incident_address = get_address(img_path)
-        report_data.police_station = str(
-            POLICE_DICT[report_data.incident_address["district"]]
+        source_paths = source_paths or get_source_paths()
+        img_path = source_paths[0]
+        data = replace(
+            report_data,
+            incident_address=dict(report_data.incident_address),
+            image_paths=list(image_paths or []),
         )
+        data.incident_datetime = get_datetime(img_path)
+
+        # data.incident_address = get_address(img_path)
+        data.police_station = str(POLICE_DICT[data.incident_address["district"]])
 
-        _prep_licence()
+        _prep_licence(data, source_paths, recognize)
 
-        if _prep_confirm():
+        if _prep_confirm(data):
             status_print("Report data confirmed", StatusLevel.SUCCESS)
-            return personal_info, report_data
+            return personal_info, data
     except Exception as e:
         status_print(f"Error preparing data: {e}", StatusLevel.ERROR)
         raise ValueError(f"Error preparing data: {e}")
@@ -1,4 +1,53 @@
-from src.core.report import kaohsiung_auto_report
+import argparse
+import sys
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.main")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("report", help="Report the photos in data/original (default)")
+    subparsers.add_parser(
+        "batch", help="Report each subdirectory of data/original as its own incident"
+    )
+    subparsers.add_parser(
+        "watch", help="Process photos continuously as they arrive in data/original"
+    )
+    verify = subparsers.add_parser(
+        "verify-email", help="Only verify pending report emails (no models loaded)"
+    )
+    verify.add_argument("--count", type=int, default=1, help="Emails to verify")
+    args = parser.parse_args()
+
+    # Subcommands import only what they use, so those without ML start quickly
+    if args.command != "verify-email":
+        from src.core.procedure import check_report_backend
+        from src.data_handling.detection import check_detection_model
+        from src.utils.ui import status_print, StatusLevel
+
+        try:
+            check_report_backend()
+            check_detection_model()
+        except ValueError as e:
+            status_print(str(e), StatusLevel.ERROR)
+            sys.exit(1)
+
+    if args.command == "verify-email":
+        from src.utils.mail import process_email
+
+        process_email(expected=args.count)
+    elif args.command == "watch":
+        from src.core.ingest import run_ingest
+
+        run_ingest()
+    elif args.command == "batch":
+        from src.core.report import kaohsiung_batch_report
+
+        kaohsiung_batch_report()
+    else:
+        from src.core.report import kaohsiung_auto_report
+
+        kaohsiung_auto_report()
+
 
 if __name__ == "__main__":
-    kaohsiung_auto_report()
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import CAPTCHA_CORPUS_DIR
+from src.data_handling.captcha import (
+    FAILED_ORIGINS,
+    get_captcha_recognizer,
+    load_captcha_corpus,
+)
+from src.data_handling.processing import load_rgb_array, ocr, solve_captcha
+from src.data_handling.recognition import get_ocr_engine
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+ACCURACY_TOLERANCE = 0.01
+LATENCY_TOLERANCE = 0.2
+
+
+def _run(
+    solve: Callable[[np.ndarray], Optional[str]],
+    samples: List[Tuple[np.ndarray, str, str]],
+) -> Dict[str, Any]:
+    """
+    Solves every sample and summarizes accuracy and latency in milliseconds.
+
+    Accuracy is also given per origin, since captchas the website accepted
+    are the ones the solver already got right once.
+    """
+    latencies, by_origin = [], {}
+    for image, label, origin in samples:
+        started = time.perf_counter()
+        try:
+            text = solve(image)
+        except Exception:
+            text = None
+        latencies.append((time.perf_counter() - started) * 1000)
+        by_origin.setdefault(origin, []).append(text == label)
+
+    latencies = np.array(latencies)
+    correct = sum(sum(results) for results in by_origin.values())
+    return {
+        "samples": len(samples),
+        "accuracy": correct / len(samples),
+        "by_origin": {
+            origin: sum(results) / len(results)
+            for origin, results in sorted(by_origin.items())
+        },
+        "mean_ms": float(latencies.mean()),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def _regressions(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]
+) -> List[str]:
+    """Lists the solvers that got less accurate or slower than the baseline."""
+    problems = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current["accuracy"] < previous["accuracy"] - ACCURACY_TOLERANCE:
+            problems.append(
+                f"{name}: accuracy {previous['accuracy']:.1%} -> {current['accuracy']:.1%}"
+            )
+        if current["p95_ms"] > previous["p95_ms"] * (1 + LATENCY_TOLERANCE):
+            problems.append(
+                f"{name}: p95 {previous['p95_ms']:.1f} ms -> {current['p95_ms']:.1f} ms"
+            )
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.captcha_benchmark",
+        description="Compare the captcha model and OCR on the labelled corpus",
+    )
+    parser.add_argument("--corpus", default=CAPTCHA_CORPUS_DIR)
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    parser.add_argument(
+        "--baseline", help="Exit with an error if worse than these JSON results"
+    )
+    parser.add_argument(
+        "--accepted-only",
+        action="store_true",
+        help="Run without hand-labelled failures; accuracy is then overstated",
+    )
+    parser.add_argument(
+        "--ocr-only",
+        action="store_true",
+        help="Measure OCR alone when the captcha model is not available",
+    )
+    args = parser.parse_args()
+
+    samples = [
+        (load_rgb_array(path), label, origin)
+        for path, label, origin in load_captcha_corpus(args.corpus)
+    ]
+    if not samples:
+        status_print(f"No labelled captchas in {args.corpus}", StatusLevel.ERROR)
+        sys.exit(1)
+    if not any(origin in FAILED_ORIGINS for _, _, origin in samples):
+        if not args.accepted_only:
+            status_print(
+                "Only accepted captchas in the corpus, label the rejected and "
+                "unreadable ones with python -m src.tools.label_captchas first",
+                StatusLevel.ERROR,
+            )
+            sys.exit(1)
+        status_print(
+            "Only accepted captchas in the corpus, accuracy is overstated",
+            StatusLevel.WARNING,
+        )
+
+    solvers = {"ocr": lambda image: ocr(image, text_line=True)}
+    get_ocr_engine().warm_up()
+    recognizer = get_captcha_recognizer()
+    if recognizer.available():
+        recognizer.warm_up()
+        solvers["recognizer"] = lambda image: recognizer.predict(image)[0]
+        solvers["combined"] = solve_captcha
+    elif not args.ocr_only:
+        status_print(
+            f"Captcha model {recognizer.model_path} not available, "
+            "pass --ocr-only to measure OCR alone",
+            StatusLevel.ERROR,
+        )
+        sys.exit(1)
+
+    results = {name: _run(solve, samples) for name, solve in solvers.items()}
+    for name, result in results.items():
+        status_print(
+            f"{name:<10} accuracy {result['accuracy']:6.1%}  "
+            f"mean {result['mean_ms']:7.1f} ms  p50 {result['p50_ms']:7.1f} ms  "
+            f"p95 {result['p95_ms']:7.1f} ms  ({result['samples']} samples)",
+            StatusLevel.INFO,
+        )
+        for origin, accuracy in result["by_origin"].items():
+            status_print(f"{'':<10} {origin:<10} {accuracy:6.1%}", StatusLevel.INFO)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = _regressions(results, json.load(f))
+        for problem in problems:
+            status_print(f"Regression: {problem}", StatusLevel.ERROR)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.config import DETECTION_BATCH_SIZE, INPUT_DIR
+from src.data_handling.detection import (
+    LICENCE_MODELS,
+    LicencePlateDetector,
+    PlateDetection,
+)
+from src.data_handling.input import SUPPORTED_EXTENSIONS
+from src.data_handling.processing import load_detection_input
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+REFERENCE_VARIANT = "fp32"
+AGREEMENT_IOU = 0.5
+PERCENTILES = (50, 90, 99)
+
+
+def load_image_set(directory: str, limit: Optional[int] = None) -> List[Image.Image]:
+    """Decodes the photos of a directory as the pipeline does for detection."""
+    paths = sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(SUPPORTED_EXTENSIONS) and not name.startswith(".")
+    )
+    return [load_detection_input(path) for path in paths[:limit]]
+
+
+def _iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of two (N, 4) and (M, 4) arrays of xyxy boxes."""
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return intersection / (area_a[:, None] + area_b[None, :] - intersection + 1e-9)
+
+
+def _matches(reference: List[PlateDetection], candidate: List[PlateDetection]) -> int:
+    """Greedily pairs boxes of the two detection sets at or above AGREEMENT_IOU."""
+    if not reference or not candidate:
+        return 0
+    iou = _iou(
+        np.array([d.box for d in reference]), np.array([d.box for d in candidate])
+    )
+    matched = 0
+    while iou.size and iou.max() >= AGREEMENT_IOU:
+        i, j = np.unravel_index(iou.argmax(), iou.shape)
+        iou[i, :], iou[:, j] = 0, 0
+        matched += 1
+    return matched
+
+
+def agreement(
+    reference: List[List[PlateDetection]], candidate: List[List[PlateDetection]]
+) -> Dict[str, float]:
+    """
+    Compare a variant's detections against the reference model's, image by image.
+
+    Args:
+        reference (List[List[PlateDetection]]): Reference detections per image
+        candidate (List[List[PlateDetection]]): Variant detections per image
+
+    Returns:
+        Dict[str, float]: Share of reference boxes found (recall), share of
+        variant boxes confirmed (precision) and share of images whose best
+        box agrees (top_agreement)
+    """
+    matched = sum(map(_matches, reference, candidate))
+    reference_total = sum(map(len, reference))
+    candidate_total = sum(map(len, candidate))
+    top_agreement = sum(
+        _matches(ref[:1], cand[:1]) == 1 if ref and cand else not ref and not cand
+        for ref, cand in zip(reference, candidate)
+    )
+    return {
+        "recall": matched / reference_total if reference_total else 1.0,
+        "precision": matched / candidate_total if candidate_total else 1.0,
+        "top_agreement": top_agreement / len(reference),
+    }
+
+
+def benchmark_variant(
+    model_path: str, images: List[Image.Image], runs: int, batch_size: int
+) -> Tuple[Dict[str, float], List[List[PlateDetection]]]:
+    """
+    Time one model variant on the image set.
+
+    Args:
+        model_path (str): ONNX model to load
+        images (List[Image.Image]): Images to detect plates in
+        runs (int): Passes over the image set for the latency percentiles
+        batch_size (int): Batch size of the throughput pass
+
+    Returns:
+        Tuple[Dict[str, float], List[List[PlateDetection]]]: Timings, and the
+        detections of the last pass
+    """
+    detector = LicencePlateDetector(model_path)
+    detector.warm_up()
+
+    latencies = []
+    for _ in range(runs):
+        detections = []
+        for image in images:
+            started = time.perf_counter()
+            detections.append(detector.detect(image))
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    detector.detect_batch(images, batch_size)
+    batch_seconds = time.perf_counter() - started
+
+    latencies = np.array(latencies)
+    metrics = {"load_s": detector.timings.load_time, "mean_ms": float(latencies.mean())}
+    for percentile in PERCENTILES:
+        metrics[f"p{percentile}_ms"] = float(np.percentile(latencies, percentile))
+    metrics["images_per_s"] = 1000 / metrics["mean_ms"]
+    metrics["batched_images_per_s"] = len(images) / batch_seconds
+    return metrics, detections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.detector_benchmark",
+        description="Compare licence plate model variants on a local image set",
+    )
+    parser.add_argument("--images", default=INPUT_DIR, help="Directory of photos")
+    parser.add_argument("--limit", type=int, help="Use at most this many photos")
+    parser.add_argument("--runs", type=int, default=3, help="Timed passes per variant")
+    parser.add_argument("--batch-size", type=int, default=DETECTION_BATCH_SIZE)
+    parser.add_argument(
+        "--variants",
+        nargs="+",
+        choices=list(LICENCE_MODELS),
+        help="Variants to compare (default: every exported model)",
+    )
+    parser.add_argument("--output", help="Write the results to a JSON file")
+    args = parser.parse_args()
+
+    images = load_image_set(args.images, args.limit)
+    if not images:
+        status_print(f"No photos in {args.images}", StatusLevel.ERROR)
+        sys.exit(1)
+
+    variants = args.variants or [
+        variant for variant, path in LICENCE_MODELS.items() if os.path.exists(path)
+    ]
+    results, detections = {}, {}
+    for variant in variants:
+        status_print(f"Benchmarking {variant} on {len(images)} photos...")
+        results[variant], detections[variant] = benchmark_variant(
+            LICENCE_MODELS[variant], images, args.runs, args.batch_size
+        )
+
+    for variant, metrics in results.items():
+        if REFERENCE_VARIANT in detections and variant != REFERENCE_VARIANT:
+            metrics.update(
+                agreement(detections[REFERENCE_VARIANT], detections[variant])
+            )
+        line = (
+            f"{variant:<10} load {metrics['load_s']:5.2f}s  "
+            f"p50 {metrics['p50_ms']:6.1f}  p90 {metrics['p90_ms']:6.1f}  "
+            f"p99 {metrics['p99_ms']:6.1f} ms  "
+            f"{metrics['images_per_s']:5.1f} img/s "
+            f"({metrics['batched_images_per_s']:5.1f} batched)"
+        )
+        if "recall" in metrics:
+            line += (
+                f"  vs {REFERENCE_VARIANT}: recall {metrics['recall']:.1%}, "
+                f"precision {metrics['precision']:.1%}, "
+                f"top box {metrics['top_agreement']:.1%}"
+            )
+        status_print(line, StatusLevel.INFO)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
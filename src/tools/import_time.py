@@ -0,0 +1,80 @@
+import argparse
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+DEFAULT_MODULES = ["src.main", "src.core.report", "src.core.ingest", "src.utils.mail"]
+IMPORT_TIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_imports(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Import a module in a fresh interpreter under `python -X importtime`.
+
+    Args:
+        module (str): Dotted module name to import
+
+    Returns:
+        List[Tuple[str, int, int]]: (name, nesting depth, cumulative microseconds)
+        per import, in the order they finished, without interpreter startup
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise ValueError(f"measure_imports(): Module={module}: {result.stderr.strip()}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        # Nesting is shown by indentation, two spaces per level
+        depth = (len(match.group(2)) - 1) // 2
+        imports.append((match.group(3), depth, int(match.group(1))))
+        if depth == 0 and match.group(3) == "site":  # Interpreter startup ends here
+            imports.clear()
+    return imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.import_time",
+        description="Report the cold import time of entry point modules",
+    )
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument(
+        "--budget-ms", type=float, help="Exit with an error if any module is slower"
+    )
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        imports = measure_imports(module)
+        total_ms = sum(us for _, depth, us in imports if depth == 0) / 1000
+        status_print(f"{module}: {total_ms:.0f} ms", StatusLevel.INFO)
+
+        # The dependencies pulled in directly by the module and its packages
+        direct = sorted((i for i in imports if i[1] == 1), key=lambda i: -i[2])
+        for name, _, us in direct[: args.top]:
+            status_print(f"  {us / 1000:8.1f} ms  {name}", StatusLevel.INFO)
+        if args.budget_ms is not None and total_ms > args.budget_ms:
+            over_budget.append(module)
+
+    for module in over_budget:
+        status_print(
+            f"{module} exceeds the {args.budget_ms:.0f} ms budget", StatusLevel.ERROR
+        )
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
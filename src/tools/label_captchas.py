@@ -0,0 +1,48 @@
+import argparse
+import sys
+
+from PIL import Image
+
+from src.data_handling.captcha import (
+    UNLABELLED_DIR,
+    label_captcha,
+    load_unlabelled_captchas,
+)
+from src.utils.ui import clean_input, status_print, StatusLevel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.label_captchas",
+        description="Label rejected and unreadable captchas by hand for the corpus",
+    )
+    parser.add_argument("--unlabelled", default=UNLABELLED_DIR)
+    args = parser.parse_args()
+
+    samples = load_unlabelled_captchas(args.unlabelled)
+    if not samples:
+        status_print(f"No unlabelled captchas in {args.unlabelled}", StatusLevel.INFO)
+        sys.exit(0)
+
+    labelled = 0
+    for index, (path, origin, guess) in enumerate(samples, 1):
+        Image.open(path).show()
+        hint = f", OCR read {guess}" if guess else ""
+        label = clean_input(
+            f"[{index}/{len(samples)}] {origin}{hint}. Text (empty skips): "
+        ).strip()
+        if not label:
+            continue
+        if not label.isalnum():
+            status_print(
+                f"Skipped {path}: letters and digits only", StatusLevel.WARNING
+            )
+            continue
+        label_captcha(path, origin, label)
+        labelled += 1
+
+    status_print(f"Labelled {labelled}/{len(samples)} captcha(s)", StatusLevel.SUCCESS)
+
+
+if __name__ == "__main__":
+    main()
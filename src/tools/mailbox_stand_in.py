@@ -0,0 +1,540 @@
+import argparse
+import email.policy
+import html
+import io
+import json
+import os
+import random
+import secrets
+import threading
+import time
+from contextlib import ExitStack
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from bs4 import BeautifulSoup
+from PIL import Image, ImageDraw
+
+from src.config import INCIDENT_LIST, POLICE_DICT
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+PAGES_DIR = "assets/mailbox_pages"
+PAGE_FILES = {"statement": "statement.html", "report": "report.html"}
+PREFIX_ID = "ContentPlaceHolder1_"
+PREFIX_NAME = "ctl00$ContentPlaceHolder1$"
+SESSION_COOKIE = "ASP.NET_SessionId"
+CAPTCHA_DIGITS = 4
+CAR_TYPES = ["汽車", "機車", "大型車", "其他"]
+CATEGORIES: Dict[str, List[str]] = {"999": ["其他違規"]}
+for _incident in INCIDENT_LIST:
+    CATEGORIES.setdefault(_incident["parent_value"], []).append(
+        _incident["child_value"]
+    )
+TEXT_FIELDS = [
+    "Name",
+    "txtCardID",
+    "ucsAddress$txtAddress",
+    "EMail",
+    "Phone",
+    "uscPlace$txtAddress",
+    "ViolationDate",
+    "LicenseNo",
+    "LicenseNo2",
+]
+REQUIRED_FIELDS = TEXT_FIELDS + ["Content", "rblCarType", "ViolationArea"]
+STATE_FIELDS = ("__EVENTTARGET", "__EVENTARGUMENT", "__VIEWSTATE", "__EVENTVALIDATION")
+
+
+def _postback(name: str) -> str:
+    """The handler ASP.NET renders on AutoPostBack controls."""
+    return (
+        "javascript:setTimeout('__doPostBack(\\'"
+        + PREFIX_NAME
+        + name
+        + "\\',\\'\\')', 0)"
+    )
+
+
+class _Session:
+    """Server-side state of one visitor, as ASP.NET keeps it."""
+
+    def __init__(self):
+        self.view_state = ""
+        self.event_validation = ""
+        self.values: Dict[str, str] = {
+            "ddlViolationEventCategory": next(iter(CATEGORIES))
+        }
+        self.files: List[str] = []
+        self.captcha = ""
+        self.accepted_terms = False
+
+    def issue_state(self) -> Tuple[str, str]:
+        """Rotates the page state tokens; only the latest ones are accepted back."""
+        self.view_state = secrets.token_urlsafe(48)
+        self.event_validation = secrets.token_urlsafe(24)
+        return self.view_state, self.event_validation
+
+
+def _state_inputs(session: _Session) -> str:
+    view_state, event_validation = session.issue_state()
+    return "".join(
+        f'<input type="hidden" name="{name}" id="{name}" value="{value}" />'
+        for name, value in [
+            ("__EVENTTARGET", ""),
+            ("__EVENTARGUMENT", ""),
+            ("__VIEWSTATE", view_state),
+            ("__VIEWSTATEGENERATOR", "C0A5BD3C"),
+            ("__EVENTVALIDATION", event_validation),
+        ]
+    )
+
+
+def _page(session: _Session, action: str, body: str, multipart: bool = False) -> str:
+    enctype = ' enctype="multipart/form-data"' if multipart else ""
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8" /></head><body>'
+        f'<form method="post" action="./{action}" id="form1"{enctype}>'
+        f"{_state_inputs(session)}{body}</form></body></html>"
+    )
+
+
+def _input(
+    name: str,
+    value: Optional[str] = "",
+    kind: str = "text",
+    extra: str = "",
+    element_id: Optional[str] = None,
+) -> str:
+    value = "" if value is None else f' value="{html.escape(value)}"'
+    element_id = element_id or name.replace("$", "_")
+    return (
+        f'<input type="{kind}" name="{PREFIX_NAME}{name}" '
+        f'id="{PREFIX_ID}{element_id}"{value}{extra} />'
+    )
+
+
+def _select(name: str, options: List[Tuple[str, str]], selected: str, extra="") -> str:
+    rendered = "".join(
+        f'<option value="{html.escape(value)}"'
+        + (' selected="selected"' if value == selected else "")
+        + f">{html.escape(text)}</option>"
+        for value, text in options
+    )
+    return (
+        f'<select name="{PREFIX_NAME}{name}" id="{PREFIX_ID}{name}"{extra}>'
+        f"{rendered}</select>"
+    )
+
+
+def render_statement(session: _Session, error: str = "") -> str:
+    checkboxes = "".join(_input(f"chk{i}", None, "checkbox") for i in range(1, 5))
+    return _page(
+        session,
+        "Statement.aspx",
+        f"<p>{error}</p>{checkboxes}"
+        + _input("IWantToReport", "我要檢舉", kind="submit"),
+    )
+
+
+def render_report(session: _Session, error: str = "") -> str:
+    values = session.values
+    fields = "".join(_input(name, values.get(name, "")) for name in TEXT_FIELDS)
+    car_types = "".join(
+        _input(
+            "rblCarType",
+            str(i),
+            "radio",
+            ' checked="checked"' if values.get("rblCarType") == str(i) else "",
+            element_id=f"rblCarType_{i}",
+        )
+        + f"<label>{label}</label>"
+        for i, label in enumerate(CAR_TYPES)
+    )
+    category = values["ddlViolationEventCategory"]
+    files = "".join(f"<li>{html.escape(name)}</li>" for name in session.files)
+    body = (
+        f'<p class="error">{error}</p>{fields}{car_types}'
+        f'<textarea name="{PREFIX_NAME}Content" id="{PREFIX_ID}Content">'
+        f"{html.escape(values.get('Content', ''))}</textarea>"
+        + _select(
+            "ViolationArea",
+            [("", "請選擇")] + [(str(v), k) for k, v in POLICE_DICT.items()],
+            values.get("ViolationArea", ""),
+        )
+        + _select(
+            "ddlViolationEventCategory",
+            [(value, value) for value in CATEGORIES],
+            category,
+            f' onchange="{_postback("ddlViolationEventCategory")}"',
+        )
+        + _select(
+            "TitleDropDownList",
+            [(title, title) for title in CATEGORIES[category]],
+            values.get("TitleDropDownList", ""),
+        )
+        + _input("fl_File", kind="file", extra=' multiple="multiple"')
+        + _input("btnMailFile", "上傳", kind="submit")
+        + f'<ul id="{PREFIX_ID}FileList">{files}</ul>'
+        + f'<img id="{PREFIX_ID}imgCaptcha" src="Captcha.aspx?{time.time_ns()}" />'
+        + _input("txtCode")
+        + _input("IWantToSympathetic", "送出", kind="submit")
+    )
+    return _page(session, "MailBox.aspx", body, multipart=True)
+
+
+def render_done(session: _Session) -> str:
+    return _page(
+        session,
+        "MailBox.aspx",
+        "<p>受理完成</p>" + _input("Continue", "繼續", "submit"),
+    )
+
+
+def _set_value(element, value: str) -> None:
+    """Shows a posted value in a captured field, as ASP.NET renders it back."""
+    if element.name == "select":
+        for option in element.find_all("option"):
+            if option.get("value", option.text) == value:
+                option["selected"] = "selected"
+            else:
+                option.attrs.pop("selected", None)
+    elif element.name == "textarea":
+        element.string = value
+    elif element.get("type", "text").lower() in ("checkbox", "radio"):
+        if element.get("value", "on") == value:
+            element["checked"] = "checked"
+        else:
+            element.attrs.pop("checked", None)
+    elif element.get("type", "text").lower() not in ("submit", "button", "file"):
+        element["value"] = value
+
+
+def render_captured(
+    template: str, session: _Session, action: str, error: str = ""
+) -> str:
+    """
+    Serve a page captured from the real site with this session's state.
+
+    The state tokens are replaced by freshly issued ones, fields show the
+    values posted so far, the titles follow the chosen category, and the
+    captcha points at the stand-in's own image.
+
+    Args:
+        template (str): HTML saved by capture_pages()
+        session (_Session): The visitor's state
+        action (str): Path the form posts back to
+        error (str): Message to show, such as a rejected captcha
+
+    Returns:
+        str: The page to serve
+    """
+    soup = BeautifulSoup(template, "html.parser")
+    form = soup.find("form")
+    form["action"] = f"./{action}"
+    view_state, event_validation = session.issue_state()
+    tokens = dict(zip(STATE_FIELDS, ("", "", view_state, event_validation)))
+    for element in form.find_all(["input", "select", "textarea"]):
+        name = element.get("name", "")
+        if name in tokens:
+            element["value"] = tokens[name]
+        if not name.startswith(PREFIX_NAME):
+            continue
+        field = name[len(PREFIX_NAME) :]
+        if field == "TitleDropDownList":
+            element.clear()
+            for title in CATEGORIES[session.values["ddlViolationEventCategory"]]:
+                option = soup.new_tag("option", value=title)
+                option.string = title
+                element.append(option)
+        if field in session.values:
+            _set_value(element, session.values[field])
+
+    captcha = soup.find(id=f"{PREFIX_ID}imgCaptcha")
+    if captcha is not None:
+        captcha["src"] = f"Captcha.aspx?{time.time_ns()}"
+    extra = BeautifulSoup(
+        f'<p class="error">{html.escape(error)}</p><ul>'
+        + "".join(f"<li>{html.escape(name)}</li>" for name in session.files)
+        + "</ul>",
+        "html.parser",
+    )
+    form.append(extra)
+    return str(soup)
+
+
+def capture_pages(pages_dir: str, statement_url: str) -> None:
+    """
+    Save the real site's terms and report pages for the stand-in to serve.
+
+    The report is never submitted, so the page shown after an accepted
+    report stays generated.
+    """
+    from src.core.http_report import FormSession, get_http_session
+
+    forms = FormSession(get_http_session())
+    statement = forms.get(statement_url)
+    page, pending = forms.fill(
+        statement, {f"{PREFIX_ID}chk{i}": True for i in range(1, 5)}
+    )
+    report = forms.post(page, pending, button=f"{PREFIX_ID}IWantToReport")
+    report.element(f"{PREFIX_ID}Name")
+
+    os.makedirs(pages_dir, exist_ok=True)
+    for key, page in (("statement", statement), ("report", report)):
+        path = os.path.join(pages_dir, PAGE_FILES[key])
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(str(page.soup))
+        status_print(f"Saved {page.url} to {path}", StatusLevel.SUCCESS)
+
+
+def load_captured_pages(pages_dir: str = PAGES_DIR) -> Dict[str, str]:
+    """Reads the pages saved by capture_pages(), empty if there are none."""
+    pages = {}
+    for key, name in PAGE_FILES.items():
+        path = os.path.join(pages_dir, name)
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as f:
+                pages[key] = f.read()
+    return pages
+
+
+def render_captcha(session: _Session) -> bytes:
+    session.captcha = "".join(random.choices("0123456789", k=CAPTCHA_DIGITS))
+    image = Image.new("RGB", (120, 40), "white")
+    ImageDraw.Draw(image).text((20, 12), " ".join(session.captcha), fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def parse_form(content_type: str, body: bytes) -> Tuple[Dict[str, str], List[str]]:
+    """Posted fields and uploaded file names of a urlencoded or multipart body."""
+    if not content_type.startswith("multipart/form-data"):
+        fields = parse_qs(body.decode("utf-8"), keep_blank_values=True)
+        return {name: values[-1] for name, values in fields.items()}, []
+
+    message = BytesParser(policy=email.policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    fields, files = {}, []
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if part.get_filename():
+            files.append(part.get_filename())
+        elif name:
+            fields[name] = part.get_payload(decode=True).decode("utf-8")
+    return fields, files
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the police mailbox flow with ASP.NET-style state checks."""
+
+    sessions: Dict[str, _Session] = {}
+    lock = threading.Lock()
+    record: Optional[io.TextIOBase] = None
+    any_captcha = False
+    pages: Dict[str, str] = {}
+
+    def _statement(self, session: _Session, error: str = "") -> bytes:
+        if "statement" in self.pages:
+            page = render_captured(
+                self.pages["statement"], session, "Statement.aspx", error
+            )
+        else:
+            page = render_statement(session, error)
+        return page.encode()
+
+    def _report(self, session: _Session, error: str = "") -> bytes:
+        if "report" in self.pages:
+            page = render_captured(self.pages["report"], session, "MailBox.aspx", error)
+        else:
+            page = render_report(session, error)
+        return page.encode()
+
+    def _session(self) -> Tuple[str, _Session]:
+        cookies = dict(
+            cookie.strip().split("=", 1)
+            for cookie in self.headers.get("Cookie", "").split(";")
+            if "=" in cookie
+        )
+        with self.lock:
+            key = cookies.get(SESSION_COOKIE)
+            if key not in self.sessions:
+                key = secrets.token_hex(12)
+                self.sessions[key] = _Session()
+            return key, self.sessions[key]
+
+    def _reply(
+        self, status: int, body: bytes, key: str, kind="text/html; charset=utf-8"
+    ):
+        self.send_response(status)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", f"{SESSION_COOKIE}={key}; path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _redirect(self, location: str, key: str) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.send_header("Set-Cookie", f"{SESSION_COOKIE}={key}; path=/; HttpOnly")
+        self.end_headers()
+
+    def _record(self, entry: Dict[str, object]) -> None:
+        if self.record is not None:
+            with self.lock:
+                self.record.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self.record.flush()
+
+    def do_GET(self) -> None:
+        key, session = self._session()
+        path = urlsplit(self.path).path
+        self._record({"method": "GET", "path": path})
+        if path == "/Statement.aspx":
+            self._reply(200, self._statement(session), key)
+        elif path == "/MailBox.aspx" and session.accepted_terms:
+            self._reply(200, self._report(session), key)
+        elif path == "/Captcha.aspx":
+            self._reply(200, render_captcha(session), key, "image/png")
+        else:
+            self._reply(404, b"Not found", key)
+
+    def do_POST(self) -> None:
+        key, session = self._session()
+        path = urlsplit(self.path).path
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        fields, files = parse_form(self.headers.get("Content-Type", ""), body)
+        self._record(
+            {
+                "method": "POST",
+                "path": path,
+                "fields": {k: v for k, v in fields.items() if not k.startswith("__")},
+                "event_target": fields.get("__EVENTTARGET", ""),
+                "files": files,
+            }
+        )
+
+        # ASP.NET rejects a postback whose state was not issued with the last page
+        if (
+            fields.get("__VIEWSTATE") != session.view_state
+            or fields.get("__EVENTVALIDATION") != session.event_validation
+        ):
+            self._reply(500, b"Validation of viewstate MAC failed.", key)
+            return
+
+        if path == "/Statement.aspx":
+            if f"{PREFIX_NAME}IWantToReport" not in fields:
+                self._reply(200, self._statement(session), key)
+            elif all(fields.get(f"{PREFIX_NAME}chk{i}") == "on" for i in range(1, 5)):
+                session.accepted_terms = True
+                self._redirect("/MailBox.aspx", key)
+            else:
+                self._reply(200, self._statement(session, "請勾選所有項目"), key)
+        elif path == "/MailBox.aspx" and session.accepted_terms:
+            category = fields.get(f"{PREFIX_NAME}ddlViolationEventCategory")
+            if category is not None and category not in CATEGORIES:
+                self._reply(500, b"Invalid postback or callback argument.", key)
+                return
+            self._reply(200, self._report_postback(session, fields, files), key)
+        else:
+            self._reply(404, b"Not found", key)
+
+    def _report_postback(
+        self, session: _Session, fields: Dict[str, str], files: List[str]
+    ) -> bytes:
+        for name, value in fields.items():
+            if name.startswith(PREFIX_NAME):
+                session.values[name[len(PREFIX_NAME) :]] = value
+        if f"{PREFIX_NAME}btnMailFile" in fields:
+            session.files += files
+        if f"{PREFIX_NAME}IWantToSympathetic" not in fields:
+            return self._report(session)
+
+        missing = [name for name in REQUIRED_FIELDS if not session.values.get(name)]
+        if not session.files:
+            missing.append("fl_File")
+        if missing:
+            return self._report(session, f"缺少欄位: {', '.join(missing)}")
+        code = session.values.pop("txtCode", "")
+        if not self.any_captcha and code != session.captcha:
+            return self._report(session, "驗證碼錯誤")
+
+        report = {
+            name: value
+            for name, value in session.values.items()
+            if name not in ("IWantToSympathetic", "btnMailFile")
+        }
+        self._record({"report": report, "files": session.files})
+        status_print(
+            f"Accepted report for {report.get('LicenseNo')}-{report.get('LicenseNo2')} "
+            f"with {len(session.files)} file(s)",
+            StatusLevel.SUCCESS,
+        )
+        return render_done(session).encode()
+
+    def log_message(self, format: str, *args) -> None:
+        status_print(f"{self.command} {self.path}: {args[1]}", StatusLevel.INFO)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.mailbox_stand_in",
+        description=(
+            "Serve a local stand-in for the police mailbox forms; point "
+            "POLICE_MAILBOX_URL at it to exercise a submission backend"
+        ),
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--record", help="Append every request as JSON lines here")
+    parser.add_argument(
+        "--any-captcha",
+        action="store_true",
+        help="Accept any captcha answer, to test the flow without the OCR models",
+    )
+    parser.add_argument(
+        "--pages",
+        default=PAGES_DIR,
+        help="Serve the pages captured here instead of generated ones",
+    )
+    parser.add_argument(
+        "--capture",
+        action="store_true",
+        help="Save the real site's pages to --pages and exit",
+    )
+    args = parser.parse_args()
+
+    if args.capture:
+        from src.core.http_report import STATEMENT_URL
+
+        capture_pages(args.pages, STATEMENT_URL)
+        return
+
+    StandInHandler.any_captcha = args.any_captcha
+    StandInHandler.pages = load_captured_pages(args.pages)
+    if not StandInHandler.pages:
+        status_print(
+            f"No captured pages in {args.pages}, serving generated ones; "
+            "run with --capture where the site is reachable",
+            StatusLevel.WARNING,
+        )
+    with ExitStack() as stack:
+        if args.record:
+            StandInHandler.record = stack.enter_context(
+                open(args.record, "a", encoding="utf-8")
+            )
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), StandInHandler)
+        status_print(f"Serving on http://127.0.0.1:{args.port}", StatusLevel.INFO)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import sys
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from PIL import Image
+
+from src.config import INPUT_DIR
+from src.data_handling.detection import DETECTION_IMAGE_SIZE, LICENCE_MODELS
+from src.tools.detector_benchmark import load_image_set
+from src.utils.ui import status_print, StatusLevel
+
+# Constants
+LETTERBOX_FILL = (114, 114, 114)
+CALIBRATION_LIMIT = 100
+
+
+def _letterbox(image: Image.Image, size: int = DETECTION_IMAGE_SIZE) -> np.ndarray:
+    """Scales and pads an RGB image to the square NCHW input YOLO is exported with."""
+    scale = min(size / image.width, size / image.height)
+    width, height = round(image.width * scale), round(image.height * scale)
+    canvas = Image.new("RGB", (size, size), LETTERBOX_FILL)
+    canvas.paste(
+        image.resize((width, height), Image.Resampling.BILINEAR),
+        ((size - width) // 2, (size - height) // 2),
+    )
+    pixels = np.asarray(canvas, dtype=np.float32) / 255.0
+    return pixels.transpose(2, 0, 1)[np.newaxis]
+
+
+def _calibration_reader(input_name: str, images: List[Image.Image]):
+    """Feeds letterboxed photos to the quantizer to calibrate activation ranges."""
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._batches: Iterator[Dict[str, np.ndarray]] = (
+                {input_name: _letterbox(image)} for image in images
+            )
+
+        def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+            return next(self._batches, None)
+
+    return _Reader()
+
+
+def export_variants(images: List[Image.Image]) -> None:
+    """
+    Derive the graph-optimized and INT8 plate models from the FP32 export.
+
+    The optimized model has shapes inferred and constant folding and node
+    fusions applied ahead of time. The INT8 model is statically quantized
+    from it (QDQ, per-channel weights) with ranges calibrated on the photos.
+
+    Args:
+        images (List[Image.Image]): Representative photos for calibration
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    quant_pre_process(LICENCE_MODELS["fp32"], LICENCE_MODELS["optimized"])
+    status_print(f"Wrote {LICENCE_MODELS['optimized']}", StatusLevel.SUCCESS)
+
+    session = ort.InferenceSession(
+        LICENCE_MODELS["optimized"], providers=["CPUExecutionProvider"]
+    )
+    quantize_static(
+        LICENCE_MODELS["optimized"],
+        LICENCE_MODELS["int8"],
+        _calibration_reader(session.get_inputs()[0].name, images),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+    status_print(f"Wrote {LICENCE_MODELS['int8']}", StatusLevel.SUCCESS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.quantize_detector",
+        description="Export graph-optimized and INT8 variants of the plate model",
+    )
+    parser.add_argument(
+        "--images", default=INPUT_DIR, help="Directory of calibration photos"
+    )
+    parser.add_argument("--limit", type=int, default=CALIBRATION_LIMIT)
+    args = parser.parse_args()
+
+    images = load_image_set(args.images, args.limit)
+    if not images:
+        status_print(f"No calibration photos in {args.images}", StatusLevel.ERROR)
+        sys.exit(1)
+    export_variants(images)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,292 @@
+import threading
 import time
+from collections import defaultdict
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoAlertPresentException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
-from typing import List
+from typing import Callable, Dict, List, Optional, Union
 
-DEFAULT_ELEMENT_WAIT_TIME: float = 2.5
+POLL_INTERVAL: float = 0.05
 
+# Seconds to wait for each kind of page condition before giving up
+WAIT_TIMEOUTS: Dict[str, float] = {
+    "element": 10,
+    "ready": 15,
+    "postback": 20,
+    "stale": 10,
+    "upload": 5,
+}
 
-def wait_seconds(driver: WebDriver, seconds: float = DEFAULT_ELEMENT_WAIT_TIME) -> None:
-    time.sleep(seconds)
+# Marks postbacks as pending from the moment the browser starts one: form submits,
+# __doPostBack calls and change/click events on AutoPostBack controls. Pending is
+# cleared by the new document on full postbacks and by endRequest on partial ones.
+_TRACK_POSTBACKS_JS = """
+if (!window.__formWaitArmed) {
+    window.__formWaitArmed = true;
+    const markPending = () => { window.__formPostbackPending = true; };
+    const original = window.__doPostBack;
+    if (typeof original === "function") {
+        window.__doPostBack = function () {
+            markPending();
+            return original.apply(this, arguments);
+        };
+    }
+    document.addEventListener("submit", markPending, true);
+    for (const type of ["change", "click"]) {
+        document.addEventListener(type, (event) => {
+            const target = event.target;
+            const handler = target && target.getAttribute
+                ? (target.getAttribute("on" + type) || "") + (target.getAttribute("href") || "")
+                : "";
+            if (handler.includes("__doPostBack")) markPending();
+        }, true);
+    }
+    const prm = window.Sys && Sys.WebForms && Sys.WebForms.PageRequestManager
+        && Sys.WebForms.PageRequestManager.getInstance();
+    if (prm) prm.add_endRequest(() => { window.__formPostbackPending = false; });
+}
+window.__formPostbackPending = false;
+"""
 
+_POSTBACK_DONE_JS = """
+if (window.__formWaitArmed && window.__formPostbackPending) return false;
+if (document.readyState !== "complete") return false;
+const prm = window.Sys && Sys.WebForms && Sys.WebForms.PageRequestManager
+    && Sys.WebForms.PageRequestManager.getInstance();
+return !(prm && prm.get_isInAsyncPostBack());
+"""
 
-def wait_for_element(driver: WebDriver, selector: str) -> WebDriver:
-    return WebDriverWait(driver, DEFAULT_ELEMENT_WAIT_TIME).until(
-        ec.presence_of_element_located((By.CSS_SELECTOR, selector))
+# Applies [selector, value] pairs from a start index: text and dropdown values are
+# set and announced with input/change events, radios and checkboxes are clicked
+# into the wanted state. Stops after a field that starts a postback, since later
+# fields (cascading dropdowns) may only exist once it has completed.
+_FILL_FORM_JS = """
+const [fields, start] = arguments;
+const errors = [];
+for (let i = start; i < fields.length; i++) {
+    const [selector, value] = fields[i];
+    const element = document.querySelector(selector);
+    if (!element) {
+        errors.push(selector + ": not found");
+        continue;
+    }
+    if (element.type === "radio" || element.type === "checkbox") {
+        if (element.checked === value) continue;
+        element.click();
+    } else {
+        if (element.tagName === "SELECT"
+            && !Array.from(element.options).some((o) => o.value === value)) {
+            errors.push(selector + ": no option " + value);
+            continue;
+        }
+        if (element.value === value) continue;
+        element.value = value;
+        element.dispatchEvent(new Event("input", { bubbles: true }));
+        element.dispatchEvent(new Event("change", { bubbles: true }));
+    }
+    if (window.__formPostbackPending) return { next: i + 1, errors: errors };
+}
+return { next: fields.length, errors: errors };
+"""
+
+_wait_times: Dict[str, List[float]] = defaultdict(list)
+_wait_lock = threading.Lock()
+
+
+def _record_wait(condition: str, seconds: float) -> None:
+    with _wait_lock:
+        _wait_times[condition].append(seconds)
+
+
+def wait_breakdown() -> Dict[str, Dict[str, float]]:
+    """Count, total and longest seconds spent waiting, per condition."""
+    with _wait_lock:
+        return {
+            condition: {"count": len(times), "total": sum(times), "max": max(times)}
+            for condition, times in _wait_times.items()
+        }
+
+
+def wait_summary() -> str:
+    breakdown = sorted(wait_breakdown().items(), key=lambda item: -item[1]["total"])
+    if not breakdown:
+        return "no waits recorded"
+    total = sum(stats["total"] for _, stats in breakdown)
+    return f"waited {total:.1f}s: " + ", ".join(
+        f"{condition} {stats['total']:.1f}s ({stats['count']}x, max {stats['max']:.1f}s)"
+        for condition, stats in breakdown
+    )
+
+
+def reset_wait_breakdown() -> None:
+    with _wait_lock:
+        _wait_times.clear()
+
+
+def wait_until(
+    driver: WebDriver,
+    condition: Callable[[WebDriver], object],
+    name: str,
+    timeout: Optional[float] = None,
+):
+    """
+    Poll a condition until it returns a truthy value, recording the time spent.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance
+        condition (Callable[[WebDriver], object]): Selenium-style wait condition
+        name (str): Condition kind, used for its timeout and in the breakdown
+        timeout (Optional[float]): Overrides the condition kind's timeout
+
+    Returns:
+        The condition's last return value
+    """
+    started = time.perf_counter()
+    try:
+        # Polls can land mid-navigation, while a postback replaces the document
+        return WebDriverWait(
+            driver,
+            timeout or WAIT_TIMEOUTS[name],
+            poll_frequency=POLL_INTERVAL,
+            ignored_exceptions=(JavascriptException, StaleElementReferenceException),
+        ).until(condition)
+    finally:
+        _record_wait(name, time.perf_counter() - started)
+
+
+def wait_for_ready_state(driver: WebDriver) -> None:
+    wait_until(
+        driver,
+        lambda d: d.execute_script("return document.readyState") == "complete",
+        "ready",
+    )
+
+
+def track_postbacks(driver: WebDriver) -> None:
+    """Instruments the current document so a postback can be waited on reliably."""
+    driver.execute_script(_TRACK_POSTBACKS_JS)
+
+
+def wait_for_postback(driver: WebDriver) -> None:
+    """Waits until any postback started since track_postbacks() has completed."""
+    wait_until(driver, lambda d: d.execute_script(_POSTBACK_DONE_JS), "postback")
+
+
+def wait_for_staleness(driver: WebDriver, element: WebElement) -> None:
+    """Waits until the page holding an element has been replaced."""
+    wait_until(driver, ec.staleness_of(element), "stale")
+    wait_for_ready_state(driver)
+
+
+def wait_for_element(driver: WebDriver, selector: str) -> WebElement:
+    return wait_until(
+        driver, ec.presence_of_element_located((By.CSS_SELECTOR, selector)), "element"
     )
 
 
 def fill_text_field(driver: WebDriver, selector: str, value: str) -> None:
     element = wait_for_element(driver, selector)
+    track_postbacks(driver)
     element.clear()
     element.send_keys(value)
-    wait_seconds(driver, DEFAULT_ELEMENT_WAIT_TIME)
+    # Fire the change event now, while its postback can still be waited on
+    driver.execute_script("arguments[0].blur()", element)
+    wait_for_postback(driver)
 
 
-def select_dropdown_field(driver: WebDriver, selector: str, value: str) -> None:
-    element = wait_for_element(driver, selector)
-    for option in element.find_elements(By.TAG_NAME, "option"):
-        if option.get_attribute("value") == value:
-            option.click()
-            break
-    wait_seconds(driver, DEFAULT_ELEMENT_WAIT_TIME)
+def fill_form(driver: WebDriver, fields: Dict[str, Union[str, bool]]) -> None:
+    """
+    Fill many fields in one injected script call, in the order given.
+
+    A field whose change starts a postback ends the call; the rest are filled
+    by another call once the postback has completed, so cascading dropdowns
+    get their options first.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance
+        fields (Dict[str, Union[str, bool]]): CSS selector to text or option
+            value, or to the checked state of a radio button or checkbox
+    """
+    items = [[selector, value] for selector, value in fields.items()]
+    start, errors = 0, []
+    while start < len(items):
+        result = driver.execute_script(
+            _TRACK_POSTBACKS_JS + _FILL_FORM_JS, items, start
+        )
+        start = result["next"]
+        errors += result["errors"]
+        wait_for_postback(driver)
+    if errors:
+        raise ValueError(f"fill_form(): {'; '.join(errors)}")
 
 
 def upload_attachments(driver: WebDriver, selector: str, file_paths: List[str]) -> None:
     element = wait_for_element(driver, selector)
     element.send_keys("\n".join(file_paths))
-    wait_seconds(driver, DEFAULT_ELEMENT_WAIT_TIME)
+    wait_until(
+        driver,
+        lambda d: d.execute_script("return arguments[0].files.length", element)
+        == len(file_paths),
+        "upload",
+    )
 
 
-def click_element(driver: WebDriver, selector: str) -> None:
-    element = wait_for_element(driver, selector)
+def wait_for_uploaded(driver: WebDriver, file_names: List[str]) -> bool:
+    """
+    Waits for the uploaded file names to be listed on the page.
+
+    Returns:
+        bool: False if they did not show up within the upload timeout
+    """
+    try:
+        wait_until(
+            driver,
+            lambda d: all(
+                name in text
+                for text in [d.execute_script("return document.body.innerText")]
+                for name in file_names
+            ),
+            "upload",
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def dismiss_alert(driver: WebDriver) -> Optional[str]:
+    """Accepts an open alert dialog and returns its text, or None if none is open."""
+    try:
+        alert = driver.switch_to.alert
+        text = alert.text
+        alert.accept()
+        return text
+    except NoAlertPresentException:
+        return None
+
+
+def click_element(driver: WebDriver, selector: str, navigates: bool = False) -> None:
+    """
+    Click an element, then wait for the page to settle.
+
+    Args:
+        driver (WebDriver): The Selenium WebDriver instance
+        selector (str): CSS selector of the element
+        navigates (bool): The click loads a new page, so wait for this one to go
+    """
+    element = wait_until(
+        driver, ec.element_to_be_clickable((By.CSS_SELECTOR, selector)), "element"
+    )
+    track_postbacks(driver)
     element.click()
-    wait_seconds(driver, DEFAULT_ELEMENT_WAIT_TIME)
+    if navigates:
+        wait_for_staleness(driver, element)
+    else:
+        wait_for_postback(driver)
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+
+# Constants
+LATENCY_HISTORY = 100
+
+
+class LatencyStats:
+    """Load time and recent call latencies of a resident model, in seconds."""
+
+    def __init__(self, history: int = LATENCY_HISTORY):
+        self.load_time: Optional[float] = None
+        self.count = 0
+        self._latencies: Deque[float] = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+            self.count += 1
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Records the time spent in the block as one call."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(time.perf_counter() - started)
+
+    @contextmanager
+    def measure_load(self) -> Iterator[None]:
+        """Records the time spent in the block as the load time."""
+        started = time.perf_counter()
+        yield
+        self.load_time = time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            latencies = list(self._latencies)
+            count = self.count
+        return {
+            "load_time": self.load_time,
+            "count": count,
+            "last_latency": latencies[-1] if latencies else None,
+            "mean_latency": sum(latencies) / len(latencies) if latencies else None,
+            "max_latency": max(latencies) if latencies else None,
+        }
+
+    def summary(self, name: str) -> str:
+        """One line such as "detector loaded in 1.20s, 3 inference(s), ..."."""
+        stats = self.stats()
+        if stats["load_time"] is None:
+            return f"{name} not loaded"
+        summary = f"{name} loaded in {stats['load_time']:.2f}s"
+        if stats["mean_latency"] is not None:
+            summary += (
+                f", {stats['count']} inference(s), "
+                f"mean {stats['mean_latency'] * 1000:.0f} ms, "
+                f"last {stats['last_latency'] * 1000:.0f} ms"
+            )
+        return summary
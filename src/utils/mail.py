@@ -35,8 +35,8 @@ class EmailProcessor:
         self.config = config
         self.start_time = 0
 
-    def process_email(self) -> None:
-        """Verify the email first then delete the follow-up email."""
+    def process_email(self, expected: int = 1) -> None:
+        """Verify the emails of `expected` reports then delete the follow-up emails."""
         self.start_time = time.time()
         status_print("Starting email processing...")
 
@@ -46,7 +46,9 @@ class EmailProcessor:
             status_print(f"Connected to {self.config.host} as {self.config.user}")
 
             # Process verification emails
-            self.search_and_process(client, ["BODY", self.TARGET_URL], "verification")
+            self.search_and_process(
+                client, ["BODY", self.TARGET_URL], "verification", expected=expected
+            )
 
             # Process follow-up emails
             self.search_and_process(
@@ -56,10 +58,11 @@ class EmailProcessor:
         status_print(f"Processing completed in {time.time() - self.start_time:.1f}s")
 
     def search_and_process(
-        self, client, search_criteria, description, process_all=False
+        self, client, search_criteria, description, process_all=False, expected=1
     ):
-        """Search for messages and process them."""
+        """Search for messages and process them until `expected` are verified."""
         elapsed = 0
+        processed = 0
         while elapsed < self.MAX_WAIT:
             status_print(f"Searching for {description} emails...")
             msgs = client.search(search_criteria, charset="UTF-8")
@@ -74,8 +77,9 @@ class EmailProcessor:
                     status_print(f"Deleting {len(verified)} message(s)")
                     client.delete_messages(verified)
                     client.expunge()
+                    processed += len(verified)
 
-                if not process_all:
+                if not process_all and processed >= expected:
                     break
 
             elapsed = time.time() - self.start_time
@@ -166,7 +170,7 @@ CONFIG: ImapConfig = ImapConfig(
 )
 
 
-def process_email() -> None:
+def process_email(expected: int = 1) -> None:
     """Main function to process emails - maintains backward compatibility."""
     processor = EmailProcessor(CONFIG)
-    processor.process_email()
+    processor.process_email(expected)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.data_handling import processing
+from src.data_handling.captcha import CAPTCHA_CHARSET, decode_ctc
+
+BLANK_CAPTCHA = np.full((32, 128, 3), 255, dtype=np.uint8)
+
+
+def _probs(classes, confidence=0.99):
+    """One step per class index (0 is the CTC blank) with the given probability."""
+    probs = np.full((len(classes), len(CAPTCHA_CHARSET) + 1), 1e-4)
+    for step, index in enumerate(classes):
+        probs[step, index] = confidence
+    return probs
+
+
+def test_decode_ctc_merges_repeats_and_drops_blanks():
+    one, two = CAPTCHA_CHARSET.index("1") + 1, CAPTCHA_CHARSET.index("2") + 1
+    text, confidence = decode_ctc(_probs([one, one, 0, one, two, 0]))
+    assert text == "112"
+    assert confidence == pytest.approx(0.99)
+
+
+def test_decode_ctc_all_blank():
+    assert decode_ctc(_probs([0, 0, 0])) == ("", 0.0)
+
+
+class _Recognizer:
+    def __init__(self, available, reading):
+        self._available, self._reading = available, reading
+
+    def available(self):
+        return self._available
+
+    def predict(self, image):
+        return self._reading
+
+
+@pytest.mark.parametrize(
+    "recognizer, expected",
+    [
+        (_Recognizer(True, ("4821", 0.99)), "4821"),  # Confident model reading
+        (_Recognizer(True, ("4827", 0.30)), "ocr"),  # Unsure, falls back
+        (_Recognizer(True, ("", 0.0)), "ocr"),  # Nothing read
+        (_Recognizer(False, None), "ocr"),  # Model not shipped
+    ],
+)
+def test_solve_captcha_falls_back_to_ocr(monkeypatch, recognizer, expected):
+    monkeypatch.setattr(processing, "get_captcha_recognizer", lambda: recognizer)
+    monkeypatch.setattr(processing, "ocr", lambda image, text_line=False: "ocr")
+    assert processing.solve_captcha(BLANK_CAPTCHA) == expected
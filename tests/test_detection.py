@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.data_handling.detection import LicencePlateDetector
+
+
+class _Array:
+    def __init__(self, values):
+        self._values = np.array(values, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._values
+
+
+class _Result:
+    def __init__(self):
+        boxes = type("Boxes", (), {})()
+        boxes.xyxy, boxes.conf = _Array([[1, 1, 5, 5]]), _Array([0.9])
+        self.boxes = boxes
+
+
+class _Model:
+    """Stands in for a loaded YOLO model and records each batch it is given."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, source, **kwargs):
+        self.batches.append((len(source), kwargs["batch"]))
+        return [_Result() for _ in source]
+
+
+def _detector(static_batch):
+    detector = LicencePlateDetector(model_path="unused.onnx")
+    detector._model = _Model()
+    detector._static_batch = static_batch
+    return detector
+
+
+def _images(count):
+    return [Image.new("RGB", (32, 24)) for _ in range(count)]
+
+
+@pytest.mark.parametrize(
+    "static_batch, batch_size, images, batches",
+    [
+        (None, 1, 3, [(1, 1)] * 3),  # Dynamic model, default batch size
+        (None, 4, 3, [(3, 3)]),  # Dynamic model, short batch is not padded
+        (1, 8, 2, [(1, 1)] * 2),  # Static batch 1 overrides the configured size
+        (4, 1, 6, [(4, 4), (4, 4)]),  # Static batch 4, last batch padded
+    ],
+)
+def test_detect_batch_follows_model_batch(static_batch, batch_size, images, batches):
+    detector = _detector(static_batch)
+    detections = detector.detect_batch(_images(images), batch_size)
+    assert detector._model.batches == batches
+    assert len(detections) == images
+    assert all(len(found) == 1 for found in detections)
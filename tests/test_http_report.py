@@ -0,0 +1,112 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("requests")
+Image = pytest.importorskip("PIL.Image")
+
+from src.config import INCIDENT_LIST, POLICE_DICT
+from src.core import http_report
+from src.data_handling.schemas import EMPTY_ADDRESS, PersonalInfo, ReportData
+from src.tools import mailbox_stand_in
+from src.tools.mailbox_stand_in import StandInHandler
+
+
+@pytest.fixture
+def stand_in(tmp_path, monkeypatch):
+    """A stand-in mailbox on a free port, with submit_over_http pointed at it."""
+    record = open(tmp_path / "requests.jsonl", "w+", encoding="utf-8")
+    monkeypatch.setattr(StandInHandler, "sessions", {})
+    monkeypatch.setattr(StandInHandler, "record", record)
+    monkeypatch.setattr(StandInHandler, "any_captcha", True)
+    monkeypatch.setattr(StandInHandler, "pages", {})
+    monkeypatch.setattr(StandInHandler, "log_message", lambda *args: None)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}/Statement.aspx"
+    monkeypatch.setattr(http_report, "STATEMENT_URL", url)
+    monkeypatch.setattr(http_report, "solve_captcha", lambda image: "0000")
+    try:
+        yield url
+    finally:
+        server.shutdown()
+        server.server_close()
+        record.close()
+
+
+@pytest.fixture
+def report(tmp_path):
+    image_paths = []
+    for i in range(2):
+        path = tmp_path / f"IMG_{i}.jpg"
+        Image.new("RGB", (64, 48), (i * 100, 80, 160)).save(path, "JPEG")
+        image_paths.append(str(path))
+
+    incident = INCIDENT_LIST[0]
+    personal = PersonalInfo(
+        name="測試", ssn="A123456789", home_address="高雄市", email="a@b.c", phone="0"
+    )
+    data = ReportData(
+        licence_first="ABC",
+        licence_second="1234",
+        incident_datetime="2026/10/17 09:00",
+        vehicle_type="0",
+        incident_address=EMPTY_ADDRESS,
+        police_station=str(next(iter(POLICE_DICT.values()))),
+        complaint_description="違規停車",
+        category_parent=incident["parent_value"],
+        category_child=incident["child_value"],
+        image_paths=image_paths,
+    )
+    return personal, data
+
+
+def _accepted_reports():
+    StandInHandler.record.seek(0)
+    entries = [json.loads(line) for line in StandInHandler.record]
+    return [entry for entry in entries if "report" in entry]
+
+
+def _assert_submitted(report):
+    personal, data = report
+    (accepted,) = _accepted_reports()
+    assert accepted["files"] == ["IMG_0.jpg", "IMG_1.jpg"]
+    fields = accepted["report"]
+    assert fields["Name"] == personal.name
+    assert (fields["LicenseNo"], fields["LicenseNo2"]) == ("ABC", "1234")
+    assert fields["rblCarType"] == data.vehicle_type
+    assert fields["ddlViolationEventCategory"] == data.category_parent
+    assert fields["TitleDropDownList"] == data.category_child
+
+
+def test_submits_generated_pages(stand_in, report):
+    http_report.submit_over_http(*report)
+    _assert_submitted(report)
+
+
+def test_submits_captured_pages(stand_in, report, tmp_path):
+    mailbox_stand_in.capture_pages(str(tmp_path / "pages"), stand_in)
+    pages = mailbox_stand_in.load_captured_pages(str(tmp_path / "pages"))
+    assert set(pages) == {"statement", "report"}
+    StandInHandler.pages = pages
+
+    http_report.submit_over_http(*report)
+    _assert_submitted(report)
+
+
+def test_retries_rejected_captcha(stand_in, report, monkeypatch):
+    monkeypatch.setattr(StandInHandler, "any_captcha", False)
+    answers = iter(["wrong"])
+
+    def solve(image):
+        (session,) = StandInHandler.sessions.values()
+        return next(answers, session.captcha)
+
+    monkeypatch.setattr(http_report, "solve_captcha", solve)
+    http_report.submit_over_http(*report)
+    _assert_submitted(report)
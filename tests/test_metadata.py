@@ -0,0 +1,73 @@
+import io
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.data_handling.metadata import (
+    EXIF_HEADER,
+    JPEG_SOI,
+    _parse_metadata,
+    _read_jpeg_exif,
+)
+
+CAPTURED_AT = "2026:10:17 09:30:00"
+
+
+def _segment(marker: int, payload: bytes) -> bytes:
+    return bytes([0xFF, marker]) + (len(payload) + 2).to_bytes(2, "big") + payload
+
+
+def _jpeg(**save_args) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (16, 16), (200, 40, 40)).save(buffer, "JPEG", **save_args)
+    return buffer.getvalue()
+
+
+def _exif_bytes() -> bytes:
+    exif = Image.Exif()
+    exif[306] = CAPTURED_AT
+    return exif.tobytes()
+
+
+def _write(tmp_path, data: bytes) -> str:
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_reads_exif_jpeg(tmp_path):
+    path = _write(tmp_path, _jpeg(exif=_exif_bytes()))
+    assert _read_jpeg_exif(path).startswith(EXIF_HEADER)
+    assert _parse_metadata(path).captured_at == "2026-10-17T09:30:00"
+
+
+def test_skips_jfif_and_xmp_before_exif(tmp_path):
+    xmp = b"http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>"
+    jfif = b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    data = (
+        JPEG_SOI
+        + _segment(0xE0, jfif)
+        + _segment(0xE1, xmp)
+        + _segment(0xE1, _exif_bytes())
+        + _jpeg()[2:]
+    )
+    path = _write(tmp_path, data)
+    assert _read_jpeg_exif(path).startswith(EXIF_HEADER)
+    assert _parse_metadata(path).captured_at == "2026-10-17T09:30:00"
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"\xff\xd8\xff\xe0",  # Ends before the segment length
+        b"\xff\xd8\xff\xe0\x00",  # Half a segment length
+        b"\xff\xd8\xff\xe0\x00\x00",  # Zero length
+        b"\xff\xd8\xff\xe0\x00\x01",  # Length shorter than itself
+        b"\xff\xd8\xff\xff\xff",  # Ends in fill bytes
+        b"\xff\xd8\xff\xe1\x00\x40Exif\x00\x00",  # EXIF segment cut short
+        b"\xff\xd8\xff\xe0\x00\x10JFIF",  # Ends inside a skipped segment
+    ],
+)
+def test_truncated_headers_have_no_exif(tmp_path, data):
+    assert _read_jpeg_exif(_write(tmp_path, data)) is None
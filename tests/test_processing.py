@@ -0,0 +1,40 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from src.data_handling import processing
+from src.data_handling.metadata import ImageMetadata
+from src.data_handling.processing import MemoryBudget, iter_preprocess
+
+
+@pytest.fixture
+def photos(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"IMG_{i}.jpg"
+        Image.new("RGB", (400, 300), (i * 60, 90, 30)).save(path, "JPEG")
+        paths.append(str(path))
+    return paths
+
+
+def _run(photos, monkeypatch, cached):
+    # Keeps the test out of the shared metadata cache file
+    monkeypatch.setattr(processing, "get_metadata", lambda path: ImageMetadata())
+    monkeypatch.setattr(
+        processing,
+        "get_artifact",
+        lambda key, suffix: "cached.jpeg" if cached else None,
+    )
+    monkeypatch.setattr(processing, "process_image", lambda i, path, incident: path)
+    budget = MemoryBudget(1 << 30)
+    jobs = [(i, path, "") for i, path in enumerate(photos)]
+    assert list(iter_preprocess(jobs, budget)) == photos
+    return budget
+
+
+def test_decoded_photos_reserve_memory(photos, monkeypatch):
+    assert _run(photos, monkeypatch, cached=False).high_water > 0
+
+
+def test_cached_photos_reserve_nothing(photos, monkeypatch):
+    assert _run(photos, monkeypatch, cached=True).high_water == 0